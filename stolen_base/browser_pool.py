@@ -0,0 +1,189 @@
+import queue
+import threading
+from itertools import islice
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# Pages a driver loads before it is replaced, Chrome grows over long sessions
+MAX_PAGES = 200
+
+# Consecutive errors after which a driver is replaced
+MAX_ERRORS = 3
+
+
+class BrowserSession:
+    """
+    One warm driver that loads every page in its single tab by navigating,
+    instead of opening and closing a tab per page.
+    """
+
+    def __init__(self, factory, timeout: float = 60):
+        self.factory = factory
+        self.timeout = timeout
+        self.driver = None
+        self.recycled = 0
+        self.start()
+
+    def start(self):
+        # Reset first, a session whose driver fails to start is restarted on its next use
+        self.pages = 0
+        self.errors = 0
+        self.driver = self.factory()
+        self.wait = WebDriverWait(self.driver, self.timeout)
+
+    def get(self, url: str):
+        self.pages += 1
+        self.driver.get(url)
+
+    def healthy(self) -> bool:
+        """
+        Whether the driver still answers and is down to its single tab.
+        """
+        try:
+            self.driver.execute_script("return 1;")
+            handles = self.driver.window_handles
+            if len(handles) > 1:
+                for handle in handles[1:]:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                self.driver.switch_to.window(handles[0])
+            return True
+        except Exception:
+            return False
+
+    def recycle(self):
+        self.quit()
+        self.recycled += 1
+        self.start()
+
+    def quit(self):
+        if self.driver is None:
+            return
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.driver = None
+
+
+class BrowserPool:
+    """
+    Pool of N warm BrowserSessions shared by threads. A session is health
+    checked after an error and replaced after max_errors consecutive errors,
+    after max_pages pages or when it stops answering. A session whose
+    replacement fails to start is started again before it is next lent.
+
+    Args:
+        size: Number of drivers.
+        factory: Function returning a new driver, e.g. init_driver.
+        timeout: Timeout of each session's WebDriverWait.
+        max_pages: Pages loaded before a driver is replaced.
+        max_errors: Consecutive errors before a driver is replaced.
+    """
+
+    def __init__(self, size: int, factory, timeout: float = 60, max_pages: int = MAX_PAGES, max_errors: int = MAX_ERRORS):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_errors = max_errors
+        self.idle = queue.Queue()
+        self.sessions = []
+        self.lock = threading.Lock()
+
+        # Drivers are started one after the other, undetected_chromedriver patches its binary on start
+        for _ in range(size):
+            session = BrowserSession(factory, timeout)
+            self.sessions.append(session)
+            self.idle.put(session)
+
+    @contextmanager
+    def session(self):
+        """
+        Borrow a session for the duration of the block.
+        """
+        session = self.idle.get()
+        if session.driver is None:
+            try:
+                with self.lock:
+                    session.start()
+            except Exception:
+                self.idle.put(session)
+                raise
+
+        failed = False
+        try:
+            yield session
+            session.errors = 0
+        except Exception:
+            failed = True
+            session.errors += 1
+            raise
+        finally:
+            try:
+                if (
+                    session.pages >= self.max_pages
+                    or session.errors >= self.max_errors
+                    or (failed and not session.healthy())
+                ):
+                    # Serialized, so drivers are never started concurrently
+                    with self.lock:
+                        session.recycle()
+            except Exception as e:
+                # Not raised, it would hide the error of the block
+                print(f"Failed to restart a browser, retried on its next use: {e}")
+            finally:
+                self.idle.put(session)
+
+    def map(self, func, items):
+        """
+        Apply func(session, item) to every item on the pool's sessions. Items
+        are submitted as others complete, so closing the generator early only
+        lets the pages already loading finish.
+
+        Yields:
+            Tuple of (item, result, error) in completion order, error is None on success.
+        """
+        def run(item):
+            with self.session() as session:
+                return func(session, item)
+
+        items = iter(items)
+        executor = ThreadPoolExecutor(max_workers=self.size)
+        futures = {}
+        try:
+            # Two items per session in flight keep every session busy
+            for item in islice(items, self.size * 2):
+                futures[executor.submit(run, item)] = item
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = futures.pop(future)
+                    for next_item in islice(items, 1):
+                        futures[executor.submit(run, next_item)] = next_item
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        yield item, None, e
+                    else:
+                        yield item, result, None
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            'sessions': self.size,
+            'pages': sum(s.pages for s in self.sessions),
+            'recycled': sum(s.recycled for s in self.sessions),
+        }
+
+    def close(self):
+        for session in self.sessions:
+            session.quit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,278 @@
+import csv
+import time
+import random
+import asyncio
+from pathlib import Path
+
+import aiohttp
+import pandas as pd
+from aiohttp import web
+
+from savant_http import SAVANT_URL, USER_AGENT, parse_video_page
+from sb_data_scrapper import SBData, play_id, upload_video_data
+
+
+# SBData fields filled from a video page
+ENRICH_FIELDS = [
+    'batter_name', 'pitcher_name', 'ball_count', 'strike_count', 'pitch_type',
+    'velo', 'description', 'match_up', 'strike_zone',
+]
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket limiting requests to `rate` per second with bursts of up to
+    `burst` requests, shared by every coroutine that awaits acquire(). No
+    limit when rate is 0 or None, like leaderboard_scraper.RateLimiter.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncSavantClient:
+    """
+    aiohttp session to Savant with at most `concurrency` requests in flight,
+    at most `rate` requests per second and retries with exponential backoff
+    on connection errors, timeouts and 429/5xx responses. One client can be
+    shared by several pipelines so they stay within the same limits.
+
+    Args:
+        concurrency: Maximum number of requests in flight.
+        rate: Maximum requests per second, no limit when 0.
+        retries: Retries of a failed request.
+        backoff: Base delay of the exponential backoff in seconds.
+        timeout: Total timeout of a request in seconds.
+    """
+
+    def __init__(self, concurrency: int = 16, rate: float = 20.0, retries: int = 3, backoff: float = 1.0, timeout: float = 30):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.limiter = AsyncRateLimiter(rate, burst=concurrency)
+        self.retries = retries
+        self.backoff = backoff
+        self.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            connector=aiohttp.TCPConnector(limit=concurrency),
+            headers={'User-Agent': USER_AGENT}
+        )
+
+    async def get(self, url: str, params: dict = None) -> str:
+        """
+        Body of a page.
+
+        Raises:
+            aiohttp.ClientError: When the request still fails after the retries.
+        """
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+            try:
+                async with self.semaphore:
+                    await self.limiter.acquire()
+                    async with self.session.get(url, params=params) as response:
+                        if response.status in RETRY_STATUSES and attempt < self.retries:
+                            retry_after = response.headers.get('Retry-After', '')
+                            delay = float(retry_after) if retry_after.isdigit() else delay
+                        else:
+                            response.raise_for_status()
+                            return await response.text()
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUSES or attempt == self.retries:
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(delay)
+
+    async def close(self):
+        await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def parse_update(pid: str, html: str) -> dict:
+    """
+    SBData fields of a video page, keyed by ENRICH_FIELDS plus play_id.
+    """
+    sb = SBData()
+    upload_video_data(sb, *parse_video_page(html))
+    return {'play_id': pid, **{field: getattr(sb, field) for field in ENRICH_FIELDS}}
+
+
+class BatchWriter:
+    """
+    Appends updates to a CSV in batches, written off the event loop.
+    """
+
+    def __init__(self, path, batch_size: int = 200):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.rows = []
+        self.columns = ['play_id'] + ENRICH_FIELDS
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            self._write([], header=True)
+
+    def _write(self, rows: list, header: bool = False):
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self.columns)
+            if header:
+                writer.writeheader()
+            writer.writerows(rows)
+
+    async def write(self, update: dict):
+        self.rows.append(update)
+        if len(self.rows) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        rows, self.rows = self.rows, []
+        if rows:
+            await asyncio.to_thread(self._write, rows)
+
+
+def done_play_ids(path) -> set:
+    """
+    playIds already in an enrichment CSV, so a rerun only fetches the rest.
+    """
+    path = Path(path)
+    if not path.exists():
+        return set()
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return {row['play_id'] for row in csv.DictReader(f)}
+
+
+async def enrich(
+        play_ids,
+        output,
+        client: AsyncSavantClient = None,
+        base_url: str = SAVANT_URL,
+        workers: int = 16,
+        batch_size: int = 200
+) -> dict:
+    """
+    Fetch and parse the video page of every playId and append the SBData
+    updates to `output` in batches. playIds already in `output` are skipped.
+
+    Args:
+        play_ids: Iterable or async iterable of playIds.
+        output: CSV the updates are appended to.
+        client: Shared AsyncSavantClient, a new one with its default limits when None.
+        base_url: Savant URL, e.g. a local fixture server.
+        workers: Number of coroutines consuming play_ids.
+        batch_size: Number of updates written at once.
+
+    Returns:
+        Dictionary with the numbers of playIds done, skipped and failed, the
+        failures as (playId, error) and the elapsed time.
+    """
+    own_client = client is None
+    client = client or AsyncSavantClient()
+    writer = BatchWriter(output, batch_size)
+    done = done_play_ids(output)
+    queue = asyncio.Queue(maxsize=workers * 4)
+    stats = {'done': 0, 'skipped': 0, 'failed': []}
+    start = time.perf_counter()
+
+    async def produce():
+        if hasattr(play_ids, '__aiter__'):
+            async for pid in play_ids:
+                await queue.put(pid)
+        else:
+            for pid in play_ids:
+                await queue.put(pid)
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def consume():
+        while (pid := await queue.get()) is not None:
+            if pid in done:
+                stats['skipped'] += 1
+                continue
+            try:
+                html = await client.get(f"{base_url}/sporty-videos", params={'playId': pid})
+                await writer.write(parse_update(pid, html))
+                done.add(pid)
+                stats['done'] += 1
+            except Exception as e:
+                stats['failed'].append((pid, f"{type(e).__name__}: {e}"))
+
+    try:
+        await asyncio.gather(produce(), *(consume() for _ in range(workers)))
+    finally:
+        await writer.flush()
+        if own_client:
+            await client.close()
+
+    stats['elapsed'] = time.perf_counter() - start
+    return stats
+
+
+def apply_updates(sb_df: pd.DataFrame, updates: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fill the ENRICH_FIELDS of a DataFrame of attempts from an enrichment CSV,
+    matching on the playId of video_link. Attempts without an update keep
+    their values.
+    """
+    updates = updates.drop_duplicates(subset='play_id', keep='last').set_index('play_id')
+    sb_df = sb_df.copy()
+    keys = sb_df['video_link'].map(play_id)
+    matched = keys.isin(updates.index)
+    for field in ENRICH_FIELDS:
+        if field in updates.columns:
+            if field not in sb_df.columns:
+                sb_df[field] = ""
+            sb_df[field] = sb_df[field].astype(object)
+            sb_df.loc[matched, field] = updates.loc[keys[matched], field].to_numpy()
+    return sb_df
+
+
+def run_enrichment(play_ids, output, concurrency: int = 16, rate: float = 20.0, **kwargs) -> dict:
+    """
+    Synchronous entry point of enrich.
+    """
+    async def run():
+        async with AsyncSavantClient(concurrency=concurrency, rate=rate) as client:
+            return await enrich(play_ids, output, client, workers=concurrency, **kwargs)
+
+    return asyncio.run(run())
+
+
+def make_fixture_app(directory) -> web.Application:
+    """
+    aiohttp app serving saved video pages ({playId}.html, as written by
+    savant_http.save_fixture) at /sporty-videos, to run enrich offline
+    against a local server.
+    """
+    directory = Path(directory)
+
+    async def video(request):
+        path = directory / f"{request.query.get('playId', '')}.html"
+        if not path.exists():
+            raise web.HTTPNotFound()
+        return web.Response(text=path.read_text(encoding='utf-8'), content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/sporty-videos', video)
+    return app
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from joblib import Parallel, delayed
+
+import optuna
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss
+from sklearn.model_selection import StratifiedKFold
+
+from features import DATA_DIR, FeaturePipeline
+from train import MODELS, STUDY_STORAGE, make_model
+
+
+RESULTS_FILE = DATA_DIR / 'results' / 'evaluation.csv'
+
+# Equal width bins of predicted probability for the calibration rows
+CALIBRATION_BINS = 10
+
+RESULT_COLUMNS = ['model', 'scheme', 'fold', 'test_season', 'n_train', 'n_test', 'metric', 'bin', 'value']
+
+
+def feature_seasons(pipeline: FeaturePipeline, X: pd.DataFrame) -> pd.Series:
+    """
+    Season of every row of the feature matrix, which no longer holds the date.
+
+    Returns:
+        Series of seasons aligned with X.
+    """
+    dates = pipeline.get('margin').loc[X.index, 'date']
+    return pd.to_datetime(dates).dt.year.rename('season')
+
+
+def stratified_splits(y, n_splits: int = 5, seed: int = 42) -> list:
+    """
+    Stratified k-fold splits.
+
+    Returns:
+        List of (fold, test_season, train_idx, test_idx), test_season is None.
+    """
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed).split(np.zeros(len(y)), y)
+    return [(i, None, train_idx, test_idx) for i, (train_idx, test_idx) in enumerate(folds)]
+
+
+def season_splits(seasons, min_train_seasons: int = 1) -> list:
+    """
+    Temporal splits: every season is tested on a model trained on all the
+    seasons before it, so no fold sees the future.
+
+    Args:
+        seasons: Season of every row.
+        min_train_seasons: Number of seasons always kept for training.
+
+    Returns:
+        List of (fold, test_season, train_idx, test_idx).
+    """
+    seasons = np.asarray(seasons)
+    unique = np.sort(np.unique(seasons))
+
+    splits = []
+    for i, season in enumerate(unique[min_train_seasons:]):
+        train_idx = np.flatnonzero(seasons < season)
+        test_idx = np.flatnonzero(seasons == season)
+        splits.append((i, int(season), train_idx, test_idx))
+    return splits
+
+
+def calibration_rows(y_true, y_proba, n_bins: int = CALIBRATION_BINS) -> list:
+    """
+    Mean predicted probability, observed success rate and count of every
+    probability bin, empty bins included so folds line up.
+
+    Returns:
+        List of (metric, bin, value).
+    """
+    bins = np.clip((np.asarray(y_proba) * n_bins).astype(int), 0, n_bins - 1)
+    y_true = np.asarray(y_true, dtype=float)
+
+    count = np.bincount(bins, minlength=n_bins)
+    predicted = np.bincount(bins, weights=y_proba, minlength=n_bins)
+    observed = np.bincount(bins, weights=y_true, minlength=n_bins)
+
+    rows = []
+    for b in range(n_bins):
+        rows.append(('calibration_count', b, float(count[b])))
+        rows.append(('calibration_predicted', b, predicted[b] / count[b] if count[b] else np.nan))
+        rows.append(('calibration_observed', b, observed[b] / count[b] if count[b] else np.nan))
+    return rows
+
+
+def evaluate_fold(model: str, params: dict, X: np.ndarray, y: np.ndarray, scheme: str, split: tuple) -> list:
+    """
+    Fit a model on one fold and score its held out rows.
+
+    Returns:
+        List of result rows with the RESULT_COLUMNS.
+    """
+    fold, test_season, train_idx, test_idx = split
+
+    estimator = make_model(model, params).fit(X[train_idx], y[train_idx])
+    y_true = y[test_idx]
+    y_proba = estimator.predict_proba(X[test_idx])[:, 1]
+
+    metrics = [
+        ('log_loss', np.nan, log_loss(y_true, y_proba, labels=[0, 1])),
+        ('brier', np.nan, brier_score_loss(y_true, y_proba)),
+        ('accuracy', np.nan, accuracy_score(y_true, y_proba > 0.5)),
+    ] + calibration_rows(y_true, y_proba)
+
+    base = [model, scheme, fold, test_season, len(train_idx), len(test_idx)]
+    return [base + [metric, b, float(value)] for metric, b, value in metrics]
+
+
+def evaluate(
+        X: pd.DataFrame,
+        y: pd.Series,
+        models: dict,
+        seasons: pd.Series = None,
+        n_splits: int = 5,
+        n_jobs: int = -1,
+        results_file: Path = None
+) -> pd.DataFrame:
+    """
+    Cross-validate models with stratified k-fold and, when seasons are given,
+    season-based temporal splits. Every (model, fold) is fitted in its own
+    joblib worker.
+
+    Args:
+        X: Feature matrix.
+        y: Binary result.
+        models: Dictionary of model name ("gb", "rf" or "xgb") to hyperparameters.
+        seasons: Season of every row, enables the "season" scheme.
+        n_splits: Number of stratified folds.
+        n_jobs: Number of joblib workers, -1 for all cores.
+        results_file: Optional CSV the results are written to.
+
+    Returns:
+        Tidy DataFrame with one row per model, scheme, fold, metric and calibration bin.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=int)
+
+    schemes = {'stratified': stratified_splits(y, n_splits)}
+    if seasons is not None:
+        schemes['season'] = season_splits(seasons)
+
+    tasks = [
+        delayed(evaluate_fold)(model, params or {}, X, y, scheme, split)
+        for model, params in models.items()
+        for scheme, splits in schemes.items()
+        for split in splits
+    ]
+    rows = [row for fold_rows in Parallel(n_jobs=n_jobs)(tasks) for row in fold_rows]
+
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    results['test_season'] = results['test_season'].astype('Int64')
+    results['bin'] = results['bin'].astype('Int64')
+
+    if results_file:
+        Path(results_file).parent.mkdir(parents=True, exist_ok=True)
+        results.to_csv(results_file, index=False)
+
+    return results
+
+
+def summarize(results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mean and standard deviation of the scalar metrics over the folds of every
+    model and scheme.
+    """
+    scalar = results[results['bin'].isna()]
+    return scalar.pivot_table(index=['model', 'scheme'], columns='metric', values='value', aggfunc=['mean', 'std'])
+
+
+def best_params(model: str, storage: str = STUDY_STORAGE) -> dict:
+    """
+    Best parameters of a model's study, the estimator defaults when it has not been searched yet.
+    """
+    try:
+        return optuna.load_study(study_name=f"sb_{model}", storage=storage).best_params
+    except (KeyError, ValueError):
+        return {}
+
+
+if __name__ == '__main__':
+    pipeline = FeaturePipeline()
+    X, y = pipeline.build()
+    results = evaluate(
+        X, y,
+        models={model: best_params(model) for model in MODELS},
+        seasons=feature_seasons(pipeline, X),
+        results_file=RESULTS_FILE
+    )
+    print(summarize(results))
@@ -0,0 +1,298 @@
+import os
+import json
+import hashlib
+import inspect
+import pandas as pd
+from pathlib import Path
+from dataclasses import dataclass, field
+
+from sklearn.impute import KNNImputer
+
+from runner_time import SPEED_SPLITS_FILE, calculate_runner_time, load_speed_splits
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+FEATURE_CACHE_DIR = DATA_DIR / 'cache' / 'features'
+
+DEFAULT_SOURCES = {
+    'sb_data': [
+        DATA_DIR / 'sb_data_complete' / 'sb_data_2016-2021.csv',
+        DATA_DIR / 'sb_data_complete' / 'sb_data_2022-2025.csv',
+    ],
+    'player_speed': DATA_DIR / 'player_speed.csv',
+    'pop_time': DATA_DIR / 'pop_time.csv',
+    'speed_splits': SPEED_SPLITS_FILE,
+}
+
+DEFAULT_CONSTANTS = {
+    # Reduce sprint speed to 95% to simulate acceleration lag (defined in the notebook, not applied by any stage yet)
+    'ACCEL_PENALTY': 0.95,
+    # Approximate velocity loss due to air drag (in mph)
+    'VELO_LOSS': 2.0,
+    # Average players reaction time
+    'REACTION_TIME': 0.2,
+}
+
+# SBData player columns hold MLBAM ids once cleaned, the features use the *_id names
+ID_COLUMNS = {
+    'catcher_name': 'catcher_id',
+    'pitcher_name': 'pitcher_id',
+    'runner_name': 'runner_id',
+    'batter_name': 'batter_id',
+    'fielder_name': 'fielder_id',
+}
+
+NUMERIC_COLUMNS = [
+    'runner_stealing_runs', 'lead_distance_gained', 'at_pitchers_first_move',
+    'at_pitch_release', 'ball_count', 'strike_count', 'velo',
+]
+
+TARGET_BASE_NUM = {'2B': 2, '3B': 3}
+
+IMPUTATION_FEATURES = ['pop_time', 'avg_velo', 'at_pitch_release', 'target_base_num', 'mound_to_home']
+
+DROP_COLUMNS = [
+    'date', 'catcher_id', 'pitcher_id', 'runner_id', 'batter_id', 'fielder_id',
+    'runner_stealing_runs', 'lead_distance_gained', 'at_pitchers_first_move',
+    'distance_to_target', 'mound_to_home', 'target_base', 'velo', 'pitch_type', 'match_up',
+]
+
+
+@dataclass
+class Stage:
+    name: str
+    func: object
+    deps: list = field(default_factory=list)
+    constants: list = field(default_factory=list)
+    sources: list = field(default_factory=list)
+    version: int = 0
+    code: str = ""
+
+
+STAGES = {}
+
+
+def _code_hash(func) -> str:
+    try:
+        code = inspect.getsource(func)
+    except (OSError, TypeError):
+        code = func.__code__.co_code.hex()
+    return hashlib.sha256(code.encode()).hexdigest()[:16]
+
+
+def stage(name: str, deps: list = None, constants: list = None, sources: list = None, version: int = 0):
+    """
+    Register a feature stage. The stage function receives the pipeline followed
+    by the outputs of its dependencies and returns a DataFrame.
+
+    Args:
+        name: Name of the stage.
+        deps: Names of the stages it reads.
+        constants: Names of the constants it uses.
+        sources: Names of the source files it reads.
+        version: Bumped when a helper the stage calls changes, edits of the
+            stage function itself already change its cache key.
+    """
+    def decorator(func):
+        STAGES[name] = Stage(name, func, deps or [], constants or [], sources or [], version, _code_hash(func))
+        return func
+
+    return decorator
+
+
+def _fingerprint(path) -> list:
+    paths = path if isinstance(path, (list, tuple)) else [path]
+    fingerprint = []
+    for p in paths:
+        stat = os.stat(p)
+        fingerprint.append([str(Path(p).resolve()), stat.st_mtime_ns, stat.st_size])
+    return fingerprint
+
+
+class FeaturePipeline:
+    """
+    Builds the notebook's feature matrix as named stages. The output of every
+    stage is cached in memory and as Parquet under a key hashing the stage, its
+    code and version, the keys of its dependencies, the constants it uses and
+    the fingerprints of the files it reads, so changing one constant only recomputes the stages
+    downstream of where it is used.
+    """
+
+    def __init__(self, constants: dict = None, sources: dict = None, cache_dir: Path = FEATURE_CACHE_DIR):
+        self.constants = {**DEFAULT_CONSTANTS, **(constants or {})}
+        self.sources = {**DEFAULT_SOURCES, **(sources or {})}
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._keys = {}
+        self._frames = {}
+
+    def key(self, name: str) -> str:
+        """
+        Cache key of a stage.
+        """
+        if name not in self._keys:
+            s = STAGES[name]
+            payload = json.dumps({
+                'stage': name,
+                'code': s.code,
+                'version': s.version,
+                'deps': [self.key(dep) for dep in s.deps],
+                'constants': {c: self.constants[c] for c in s.constants},
+                'sources': {src: _fingerprint(self.sources[src]) for src in s.sources},
+            }, sort_keys=True, default=str)
+            self._keys[name] = hashlib.sha256(payload.encode()).hexdigest()[:16]
+        return self._keys[name]
+
+    def get(self, name: str) -> pd.DataFrame:
+        """
+        Output of a stage, from memory, from the disk cache or computed.
+
+        Args:
+            name: Name of the stage.
+
+        Returns:
+            DataFrame produced by the stage.
+        """
+        key = self.key(name)
+        if key in self._frames:
+            return self._frames[key].copy()
+
+        path = self.cache_dir / f"{name}-{key}.parquet" if self.cache_dir else None
+        if path and path.exists():
+            df = pd.read_parquet(path)
+        else:
+            s = STAGES[name]
+            df = s.func(self, *(self.get(dep) for dep in s.deps))
+            if path:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                df.to_parquet(path)
+
+        self._frames[key] = df
+        return df.copy()
+
+    def build(self) -> tuple:
+        """
+        Model inputs and outputs.
+
+        Returns:
+            Tuple of the feature matrix X and the binary result y.
+        """
+        data = self.get('features')
+        X = data.drop(columns=['result', 'description', 'video_link'])
+        y = data['result']
+        return X, y
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Stages                                    #
+# ---------------------------------------------------------------------------- #
+
+
+@stage('merged', sources=['sb_data', 'player_speed', 'pop_time'])
+def merged_stage(pipeline: FeaturePipeline) -> pd.DataFrame:
+    files = pipeline.sources['sb_data']
+    files = files if isinstance(files, (list, tuple)) else [files]
+    data = pd.concat([pd.read_csv(f, na_values=['--']) for f in files], ignore_index=True)
+
+    data = data.rename(columns={k: v for k, v in ID_COLUMNS.items() if v not in data.columns})
+    for col in list(ID_COLUMNS.values()) + NUMERIC_COLUMNS:
+        if col in data.columns:
+            data[col] = pd.to_numeric(data[col], errors='coerce')
+
+    player_speed_df = pd.read_csv(pipeline.sources['player_speed'])
+    pop_time_df = pd.read_csv(pipeline.sources['pop_time'])
+
+    # Add runners speed
+    data = data.merge(player_speed_df, on='runner_id', how='left')
+
+    # Add pop time based on target base
+    data = data.merge(pop_time_df, on=['target_base', 'catcher_id'], how='left')
+
+    return data
+
+
+@stage('runner', deps=['merged'], constants=['REACTION_TIME'], sources=['speed_splits'])
+def runner_stage(pipeline: FeaturePipeline, data: pd.DataFrame) -> pd.DataFrame:
+    # Time for the runner to target base
+    distance = 90 - data['at_pitch_release']
+    splits = load_speed_splits(pipeline.sources['speed_splits'])
+    runner_to_target = calculate_runner_time(data['runner_id'], distance, data['sprint_speed'], splits)
+
+    return pd.DataFrame({
+        'distance_to_target': distance,
+        'runner_to_target': runner_to_target + pipeline.constants['REACTION_TIME'],
+    }, index=data.index)
+
+
+def pitch_features(velo, velo_loss: float) -> tuple:
+    """
+    Average velocity (ft/s) of a pitch accounting for air resistance and its
+    time from mound to home. Works on scalars, arrays and Series alike.
+
+    Returns:
+        Tuple of avg_velo and mound_to_home.
+    """
+    avg_velo = ((velo + (velo - velo_loss)) / 2) * 1.46667
+    return avg_velo, 60.5 / avg_velo
+
+
+def margin_features(mound_to_home, pop_time, runner_to_target, reaction_time: float) -> tuple:
+    """
+    Time for the ball to reach the target base and its margin over the runner.
+
+    Returns:
+        Tuple of ball_to_target, time_margin and runner_safe.
+    """
+    ball_to_target = mound_to_home + pop_time + (2 * reaction_time)
+    time_margin = ball_to_target - runner_to_target
+    return ball_to_target, time_margin, time_margin > 0
+
+
+@stage('pitch', deps=['merged'], constants=['VELO_LOSS'])
+def pitch_stage(pipeline: FeaturePipeline, data: pd.DataFrame) -> pd.DataFrame:
+    avg_velo, mound_to_home = pitch_features(data['velo'], pipeline.constants['VELO_LOSS'])
+    return pd.DataFrame({'avg_velo': avg_velo, 'mound_to_home': mound_to_home}, index=data.index)
+
+
+@stage('margin', deps=['merged', 'runner', 'pitch'], constants=['REACTION_TIME'])
+def margin_stage(pipeline: FeaturePipeline, data: pd.DataFrame, runner: pd.DataFrame, pitch: pd.DataFrame) -> pd.DataFrame:
+    data = pd.concat([data, runner, pitch], axis=1)
+
+    # Binary result
+    data['result'] = (data['result'] == 'SB').astype(int)
+
+    # Time it takes the ball to reach target_base and calculated outcome of success
+    data['ball_to_target'], data['time_margin'], data['runner_safe'] = margin_features(
+        data['mound_to_home'], data['pop_time'], data['runner_to_target'], pipeline.constants['REACTION_TIME']
+    )
+
+    return data
+
+
+@stage('features', deps=['margin'])
+def features_stage(pipeline: FeaturePipeline, data: pd.DataFrame) -> pd.DataFrame:
+    # KNNImputer fill missing pop times
+    data['target_base_num'] = data['target_base'].map(TARGET_BASE_NUM)
+    imputed_data = KNNImputer(n_neighbors=5).fit_transform(data[IMPUTATION_FEATURES])
+    data['pop_time'] = imputed_data[:, IMPUTATION_FEATURES.index('pop_time')]
+
+    # One-hot encode pitch_type
+    pitch_dummies = pd.get_dummies(data['pitch_type'], prefix='pitch')
+
+    data = data.drop(columns=[col for col in DROP_COLUMNS if col in data.columns])
+    data = pd.concat([data, pitch_dummies], axis=1)
+
+    return data.dropna()
+
+
+def build_features(constants: dict = None, sources: dict = None) -> tuple:
+    """
+    Feature matrix and target of the stolen base models, from cache when possible.
+
+    Args:
+        constants: Overrides of DEFAULT_CONSTANTS.
+        sources: Overrides of DEFAULT_SOURCES.
+
+    Returns:
+        Tuple of the feature matrix X and the binary result y.
+    """
+    return FeaturePipeline(constants, sources).build()
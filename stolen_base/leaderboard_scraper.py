@@ -0,0 +1,860 @@
+import os
+import csv
+import time
+import threading
+import multiprocessing as mp
+from pathlib import Path
+from datetime import date
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable
+from operator import attrgetter
+from urllib.parse import urlparse, parse_qs
+from dataclasses import dataclass, asdict, fields
+import undetected_chromedriver as uc
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support import expected_conditions as EC
+from tqdm import tqdm
+
+from task_queue import TaskQueue
+from browser_pool import BrowserPool, BrowserSession
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+
+# Saved Savant pages of the sb and catcher boards, for backend="http" offline
+FIXTURES_DIR = DATA_DIR / 'fixtures' / 'savant'
+
+# Page loads and row expansions per second, shared by every worker of every leaderboard
+POLITENESS_RATE = 2.0
+
+# Rows buffered by RowWriter before they are written and fsynced, then marked done in the queue
+WRITE_BATCH_SIZE = 50
+
+# Seconds an expanded row or a video page gets to show its data, and how often it is checked
+EXPAND_TIMEOUT = 30
+VIDEO_TIMEOUT = 30
+POLL_FREQUENCY = 0.1
+
+# Rows of a Parquet part file, its rows are only marked done in the queue once it is closed
+PARQUET_ROWS_PER_FILE = 5000
+
+
+@dataclass(frozen=True)
+class Leaderboard:
+    """
+    Configuration of one Savant leaderboard scraped by the engine.
+
+    Args:
+        name: Short name, prefix of the worker files and of the task queue.
+        url: URL of the leaderboard.
+        record: Dataclass of one row, with a video_link field.
+        parse_row: Function filling a record from the cells of an attempt row.
+        enrichments: Functions filling a record from its video page, called
+            with (record, description, strike_zone, bullet_data). Attempts
+            are written without opening their video page when empty.
+        seasons: Default (start, end) season range.
+        n_workers: Default number of worker processes.
+        table_id: id of the leaderboard table, present once the seasons are loaded.
+        dataset: Stored CSVs an incremental scrape starts from.
+        attempts_url: URL of the attempts of one leaderboard row, formatted
+            with player_id, season_start and season_end. The http backend
+            fetches it instead of expanding the row, and needs it.
+    """
+    name: str
+    url: str
+    record: type
+    parse_row: Callable
+    enrichments: tuple = ()
+    seasons: tuple = (2016, 2025)
+    n_workers: int = 2
+    table_id: str = "basestealing_running_game_table"
+    dataset: tuple = ()
+    attempts_url: str = ""
+
+    @property
+    def fields(self) -> list:
+        return [field.name for field in fields(self.record)]
+
+    def queue_path(self) -> str:
+        return f"{self.name}_tasks.sqlite"
+
+    def worker_file(self, worker_id: int, output_format: str = "csv") -> str:
+        return f"{self.name}_data_worker_{worker_id}.{output_format}"
+
+    def worker_files(self) -> list:
+        """
+        Worker CSVs and Parquet parts in the working directory.
+        """
+        return sorted([*Path('.').glob(self.worker_file('*', 'csv')), *Path('.').glob(self.worker_file('*', 'parquet'))])
+
+    def new_record(self, values: list[str], video_link: str):
+        """
+        Record from the cells of a leaderboard sub-table row, as read by
+        parse_sub_rows or savant_http.parse_attempt_rows.
+        """
+        record = self.record()
+        self.parse_row(record, values)
+        record.video_link = video_link
+        return record
+
+    def enrich(self, record, video: tuple):
+        """
+        Fill a record from its parsed video page, see savant_http.parse_video_page.
+        """
+        for step in self.enrichments:
+            step(record, *video)
+
+
+class RateLimiter:
+    """
+    Spaces requests `1 / rate` seconds apart across every thread and process
+    it is handed to, so leaderboards scraped side by side stay within one
+    politeness budget. The next free slot lives in shared memory, so the
+    limiter has to be passed to the processes when they are started.
+
+    Args:
+        rate: Maximum requests per second, no limit when 0 or None.
+    """
+
+    def __init__(self, rate: float = POLITENESS_RATE):
+        self.interval = 1 / rate if rate else 0
+        self.next_slot = mp.Value('d', 0.0)
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.next_slot.get_lock():
+            slot = max(time.time(), self.next_slot.value)
+            self.next_slot.value = slot + self.interval
+        delay = slot - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class PhaseTimer:
+    """
+    Time spent per scraping phase, split into throttle (waiting on the
+    RateLimiter), wait (waiting on the site: page loads and DOM conditions)
+    and parse (reading the DOM or HTML into records). Shared by the threads
+    of a worker, and merged over workers with merge().
+    """
+
+    KINDS = ('throttle', 'wait', 'parse')
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def __call__(self, phase: str, kind: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.seconds[phase, kind] += elapsed
+                self.counts[phase, kind] += 1
+
+    def summary(self) -> dict:
+        """
+        Seconds and count per (phase, kind), picklable so workers can send it back.
+        """
+        with self.lock:
+            return {key: (self.seconds[key], self.counts[key]) for key in self.seconds}
+
+    def merge(self, summary: dict):
+        with self.lock:
+            for key, (seconds, count) in summary.items():
+                self.seconds[key] += seconds
+                self.counts[key] += count
+
+    def report(self) -> str:
+        """
+        Table of the seconds per phase and kind, with the number of pages or
+        rows of each phase.
+        """
+        phases = sorted({phase for phase, _ in self.seconds})
+        lines = [f"{'phase':<12}" + ''.join(f"{kind:>10}" for kind in self.KINDS) + f"{'count':>8}"]
+        for phase in phases:
+            cells = ''.join(f"{self.seconds.get((phase, kind), 0):>9.2f}s" for kind in self.KINDS)
+            lines.append(f"{phase:<12}{cells}{max(self.counts.get((phase, kind), 0) for kind in self.KINDS):>8}")
+        return '\n'.join(lines)
+
+
+class RowWriter:
+    """
+    Buffered CSV writer of records. Fields are quoted by the csv module, so
+    descriptions and strike zones keep their commas, quotes and newlines.
+    Rows are written in batches and their keys only recorded in the journal
+    (anything with record(keys) and close(), e.g. a TaskQueue) once their
+    batch is on disk, so a crash can lose at most the unflushed batch, which
+    is then scraped again.
+    """
+
+    def __init__(self, filename, header: list, journal=None, batch_size: int = WRITE_BATCH_SIZE):
+        self._init_buffer(header, journal, batch_size)
+
+        is_empty = not Path(filename).exists() or Path(filename).stat().st_size == 0
+        self.file = open(filename, 'a', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        if is_empty:
+            self.writer.writerow(self.header)
+
+    def _init_buffer(self, header: list, journal, batch_size: int):
+        """
+        State shared by every writer: the batch of rows not yet written and
+        the keys to record in the journal once they are.
+        """
+        self.header = header
+        self.values = attrgetter(*header)
+        self.journal = journal
+        self.batch_size = batch_size
+        self.rows = []
+        self.keys = []
+        self.lock = threading.RLock()
+
+    def write(self, record, key: str = ""):
+        values = self.values(record)
+        with self.lock:
+            self.rows.append(values)
+            if key:
+                self.keys.append(key)
+            if len(self.rows) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self.rows:
+                self.writer.writerows(self.rows)
+                self.file.flush()
+                os.fsync(self.file.fileno())
+            if self.journal:
+                self.journal.record(self.keys)
+            self.rows = []
+            self.keys = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+        if self.journal:
+            self.journal.close()
+
+
+class ParquetRowWriter(RowWriter):
+    """
+    RowWriter writing string columns to Parquet. Every batch becomes a row
+    group of the open part file, {stem}.part{n}.parquet next to `filename`.
+    A Parquet file is only readable once closed, so a part is closed, and
+    its keys recorded in the journal, every rows_per_file rows and on
+    flush(). A crash loses at most the open part.
+    """
+
+    def __init__(self, filename, header: list, journal=None, batch_size: int = WRITE_BATCH_SIZE, rows_per_file: int = PARQUET_ROWS_PER_FILE):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._init_buffer(header, journal, batch_size)
+        self.pa = pa
+        self.pq = pq
+        self.path = Path(filename)
+        self.schema = pa.schema([(field, pa.string()) for field in header])
+        self.rows_per_file = rows_per_file
+        self.part = None
+        self.part_rows = 0
+        self.part_keys = []
+
+    def _next_part(self) -> Path:
+        # Parts of earlier runs are kept, a restarted worker starts a new one
+        n = 0
+        while (path := self.path.with_name(f"{self.path.stem}.part{n:04d}.parquet")).exists():
+            n += 1
+        return path
+
+    def _write_batch(self):
+        if not self.rows:
+            return
+        if self.part is None:
+            self.part = self.pq.ParquetWriter(self._next_part(), self.schema)
+        columns = [self.pa.array(column, self.pa.string()) for column in zip(*self.rows)]
+        self.part.write_table(self.pa.Table.from_arrays(columns, schema=self.schema))
+        self.part_rows += len(self.rows)
+        self.part_keys += self.keys
+        self.rows = []
+        self.keys = []
+
+    def _close_part(self):
+        if self.part is not None:
+            self.part.close()
+            self.part = None
+        if self.journal:
+            self.journal.record(self.part_keys)
+        self.part_rows = 0
+        self.part_keys = []
+
+    def write(self, record, key: str = ""):
+        values = self.values(record)
+        with self.lock:
+            self.rows.append(values)
+            if key:
+                self.keys.append(key)
+            if len(self.rows) >= self.batch_size:
+                self._write_batch()
+                if self.part_rows >= self.rows_per_file:
+                    self._close_part()
+
+    def flush(self):
+        with self.lock:
+            self._write_batch()
+            self._close_part()
+
+    def close(self):
+        self.flush()
+        if self.journal:
+            self.journal.close()
+
+
+def open_writer(filename, header: list, journal=None, batch_size: int = WRITE_BATCH_SIZE) -> RowWriter:
+    """
+    RowWriter for a .csv file, ParquetRowWriter for a .parquet file.
+    """
+    if Path(filename).suffix == '.parquet':
+        return ParquetRowWriter(filename, header, journal, batch_size)
+    return RowWriter(filename, header, journal, batch_size)
+
+def play_id(video_link: str) -> str:
+    """
+    playId of a sporty-videos link, "" when the link has none.
+    """
+    if not isinstance(video_link, str) or not video_link:
+        return ""
+    return parse_qs(urlparse(video_link).query).get('playId', [""])[0]
+
+def load_known_attempts(files: list) -> tuple:
+    """
+    Latest date and playIds of the attempts already stored, so an incremental
+    scrape only looks at newer seasons and skips attempts it already has.
+
+    Args:
+        files: CSVs and Parquet files written by RowWriter and ParquetRowWriter,
+            missing files are ignored.
+
+    Returns:
+        Tuple of the max date ("" when nothing is stored) and the set of known playIds.
+    """
+    max_date = ""
+    known = set()
+    for file in files:
+        if not Path(file).exists() or os.path.getsize(file) == 0:
+            continue
+        if Path(file).suffix == '.parquet':
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(file, columns=['date', 'video_link'])
+            dates = [d for d in table.column('date').to_pylist() if d]
+            max_date = max([max_date, *dates])
+            known.update(filter(None, map(play_id, table.column('video_link').to_pylist())))
+            continue
+        with open(file, 'r', newline='', encoding='utf-8', errors='replace') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if 'date' not in header or 'video_link' not in header:
+                continue
+            date_idx = header.index('date')
+            # video_link is the last column, old files hold unquoted commas in their descriptions
+            for values in reader:
+                if len(values) <= date_idx:
+                    continue
+                max_date = max(max_date, values[date_idx].strip())
+                pid = play_id(values[-1].strip())
+                if pid:
+                    known.add(pid)
+    return max_date, known
+
+def incremental_seasons(max_date: str, default: tuple) -> tuple:
+    """
+    Season range still worth loading: from the season of the latest stored
+    attempt to the current one.
+    """
+    if not max_date:
+        return default
+    return int(max_date[:4]), max(int(max_date[:4]), date.today().year)
+
+def init_driver():
+    options = uc.ChromeOptions()
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--disable-infobars')
+    options.add_argument('--start-maximized')
+    options.add_argument('--disable-popup-blocking')
+    return uc.Chrome(options=options)
+
+def load_leaderboard(driver, wait, leaderboard: Leaderboard, seasons: tuple) -> list:
+    """
+    Load a leaderboard over a season range.
+
+    Returns:
+        Its player rows.
+    """
+    driver.get(leaderboard.url)
+    wait.until(EC.presence_of_element_located((By.ID, "ddlSeasonStart")))
+    Select(driver.find_element(By.ID, "ddlSeasonStart")).select_by_visible_text(str(seasons[0]))
+    Select(driver.find_element(By.ID, "ddlSeasonEnd")).select_by_visible_text(str(seasons[1]))
+    driver.find_element(By.ID, "btn-update").click()
+    wait.until(EC.presence_of_element_located((By.ID, leaderboard.table_id)))
+    return driver.find_elements(By.CLASS_NAME, "default-table-row")
+
+def http_backend(fixtures: str = None):
+    """
+    savant_http.HttpBackend over a pooled session, or over the saved pages
+    in `fixtures` when given.
+    """
+    from savant_http import FixtureSession, HttpBackend
+
+    return HttpBackend(FixtureSession(fixtures) if fixtures else None)
+
+def fetch_leaderboard(http, leaderboard: Leaderboard, seasons: tuple) -> list:
+    """
+    Load a leaderboard over a season range over HTTP.
+
+    Returns:
+        The attempts URL of each of its player rows.
+
+    Raises:
+        ValueError: If the leaderboard has no attempts_url.
+    """
+    from savant_http import parse_player_ids
+
+    if not leaderboard.attempts_url:
+        raise ValueError(f"The {leaderboard.name} leaderboard has no attempts_url for the http backend.")
+    season_range = {'season_start': seasons[0], 'season_end': seasons[1]}
+    html = http.get(leaderboard.url, season_range)
+    return [
+        leaderboard.attempts_url.format(player_id=player_id, **season_range)
+        for player_id in parse_player_ids(html, leaderboard.table_id)
+    ]
+
+def sub_table_loaded(row):
+    """
+    Wait condition: the tr-sub-data row after a leaderboard row is open and
+    its attempts table has rows.
+
+    Returns:
+        Condition returning the tr-sub-data row once loaded, False before.
+    """
+    def condition(driver):
+        subs = row.find_elements(By.XPATH, "following-sibling::tr[contains(@class, 'tr-sub-data')][1]")
+        if not subs or subs[0].get_attribute("data-open") != "true":
+            return False
+        return subs[0] if subs[0].find_elements(By.CSS_SELECTOR, ".all-tab-pane .default-table-row") else False
+    return condition
+
+def video_loaded(driver) -> bool:
+    """
+    Wait condition: the video page shows its video and its info bullets.
+    """
+    if not driver.find_elements(By.ID, "sporty_video"):
+        return False
+    mods = driver.find_elements(By.CLASS_NAME, "mod")
+    return bool(mods) and bool(mods[-1].find_elements(By.TAG_NAME, "li"))
+
+def expand_player_row(driver, row, timeout: float = EXPAND_TIMEOUT):
+    """
+    Open the attempts of a leaderboard row and wait until they are loaded.
+
+    Returns:
+        The tr-sub-data row holding its attempts.
+    """
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
+    driver.execute_script("arguments[0].click();", row)
+    return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(sub_table_loaded(row))
+
+def parse_sub_rows(leaderboard: Leaderboard, sub) -> list:
+    """
+    Records of the attempts of an expanded leaderboard row.
+    """
+    records = []
+    sub_data_div = sub.find_element(By.CLASS_NAME, "all-tab-pane")
+    rows = sub_data_div.find_elements(By.CLASS_NAME, "default-table-row")
+    for row in rows:
+        spans = row.find_elements(By.TAG_NAME, "span")
+        values = [s.text.strip() if not s.find_elements(By.TAG_NAME, "a") else s.find_element(By.TAG_NAME, "a").get_attribute("href").split("/")[-1] for s in spans]
+        try:
+            video_link = row.find_element(By.CLASS_NAME, "video-col").find_element(By.TAG_NAME, "a").get_attribute("href")
+        except:
+            video_link = ""
+        records.append(leaderboard.new_record(values, video_link))
+    return records
+
+def open_video_page(session: BrowserSession, video_link: str, timeout: float = VIDEO_TIMEOUT):
+    """
+    Load a video page in the session's tab and wait until its data is shown.
+    """
+    session.get(video_link)
+    WebDriverWait(session.driver, timeout, poll_frequency=POLL_FREQUENCY).until(video_loaded)
+
+def read_video_page(driver) -> tuple:
+    """
+    Data of the video page open in a driver.
+
+    Returns:
+        Tuple of the description, the strike zone inner HTML and the values
+        of the info bullets, like savant_http.parse_video_page.
+    """
+    description = driver.find_element(By.TAG_NAME, "h3").text.strip()
+    zones = driver.find_elements(By.ID, "zone_chart-zone")
+    strike_zone = zones[0].get_attribute("innerHTML") if zones else ""
+    bullets = driver.find_elements(By.CLASS_NAME, "mod")[-1].find_elements(By.TAG_NAME, "li")
+    bullet_data = [b.text.split(":")[-1].strip() for b in bullets]
+    return description, strike_zone, bullet_data
+
+def scrape_worker(
+        leaderboard: Leaderboard,
+        worker_id: int,
+        queue_path: str,
+        seasons: tuple = None,
+        known_play_ids: set = None,
+        since: str = "",
+        backend: str = "selenium",
+        fixtures: str = None,
+        pool_size: int = 1,
+        limiter: RateLimiter = None,
+        position: int = None,
+        output_format: str = "csv",
+        timings=None
+):
+    """
+    Pull tasks from the shared queue until it is empty, on pool_size threads.
+    A "runner" task reads the attempts of one leaderboard row and queues a
+    "video" task per new attempt, a "video" task runs the leaderboard's
+    enrichments on the attempt's video page and writes its row. Without
+    enrichments a runner task writes its attempts directly.
+
+    With backend="selenium" leaderboard rows are expanded in one dedicated
+    browser and video pages loaded by a BrowserPool of pool_size warm
+    drivers. With backend="http" no browser is started: the leaderboard, the
+    attempts of its rows (see Leaderboard.attempts_url) and the video pages
+    are fetched over plain HTTP and parsed by savant_http, from the saved
+    pages in `fixtures` when given.
+    Every page load and row expansion first waits on the limiter. Rows are
+    written to a CSV or, with output_format="parquet", to Parquet parts.
+
+    Pages are read as soon as their data is in the DOM, the limiter is the
+    only pacing. The time spent throttled, waiting and parsing per phase is
+    printed on exit and put on `timings` (a multiprocessing queue) when given.
+    """
+    seasons = seasons or leaderboard.seasons
+    known_play_ids = known_play_ids or set()
+    limiter = limiter or RateLimiter(0)
+    if backend not in ('selenium', 'http'):
+        raise ValueError(f"Invalid backend: {backend}")
+    if output_format not in ('csv', 'parquet'):
+        raise ValueError(f"Invalid output format: {output_format}")
+
+    queue = TaskQueue(queue_path)
+    writer = open_writer(leaderboard.worker_file(worker_id, output_format), leaderboard.fields, queue)
+    progress = tqdm(desc=f"{leaderboard.name} worker {worker_id} tasks", position=worker_id if position is None else position)
+
+    timer = PhaseTimer()
+    pool = None
+    http = None
+    if backend == 'http':
+        from savant_http import parse_attempt_rows, parse_video_page
+        http = http_backend(fixtures)
+    elif leaderboard.enrichments:
+        pool = BrowserPool(pool_size, init_driver)
+
+    board = {}
+    board_lock = threading.Lock()
+
+    def runner_attempts(index):
+        with board_lock:
+            if 'rows' not in board:
+                # Kept only once loaded, a failed load is retried by the next runner task
+                driver = None if http else init_driver()
+                try:
+                    with timer('leaderboard', 'throttle'):
+                        limiter.wait()
+                    with timer('leaderboard', 'wait'):
+                        if http:
+                            rows = fetch_leaderboard(http, leaderboard, seasons)
+                        else:
+                            rows = load_leaderboard(driver, WebDriverWait(driver, 60), leaderboard, seasons)
+                except Exception:
+                    if driver:
+                        driver.quit()
+                    raise
+                board['driver'], board['rows'] = driver, rows
+            if not http:
+                # One browser holds the leaderboard, its rows are expanded one at a time
+                with timer('expand', 'throttle'):
+                    limiter.wait()
+                with timer('expand', 'wait'):
+                    sub = expand_player_row(board['driver'], board['rows'][index])
+                with timer('expand', 'parse'):
+                    return parse_sub_rows(leaderboard, sub)
+            attempts_url = board['rows'][index]
+
+        # Over HTTP the rows are fetched side by side
+        with timer('expand', 'throttle'):
+            limiter.wait()
+        with timer('expand', 'wait'):
+            html = http.get(attempts_url)
+        with timer('expand', 'parse'):
+            return [leaderboard.new_record(values, video_link) for values, video_link in parse_attempt_rows(html)]
+
+    def video_data(video_link):
+        with timer('video', 'throttle'):
+            limiter.wait()
+        if http:
+            with timer('video', 'wait'):
+                html = http.get(video_link)
+            with timer('video', 'parse'):
+                return parse_video_page(html)
+        with pool.session() as session:
+            with timer('video', 'wait'):
+                open_video_page(session, video_link)
+            with timer('video', 'parse'):
+                return read_video_page(session.driver)
+
+    def work():
+        while True:
+            task = queue.claim(worker_id)
+            if task is None:
+                # Rows still buffered here may be the last tasks other workers wait on
+                writer.flush()
+                if queue.pending() == 0:
+                    break
+                time.sleep(5)
+                continue
+
+            task_id, kind, payload = task
+            try:
+                if kind == 'runner':
+                    videos = []
+                    rows = []
+                    for record in runner_attempts(payload['index']):
+                        key = play_id(record.video_link)
+                        # Already stored
+                        if (key and key in known_play_ids) or (since and record.date < since):
+                            continue
+                        if not leaderboard.enrichments:
+                            rows.append(record)
+                        elif key:
+                            # Only attempts with a video page can be enriched
+                            videos.append((key, asdict(record)))
+                    queue.put('video', videos, priority=1)
+                    if rows:
+                        # The task is done once its last row is on disk, a crash before that scrapes the row again
+                        for record in rows[:-1]:
+                            writer.write(record)
+                        writer.write(rows[-1], task_id)
+                    else:
+                        queue.record([task_id])
+                else:
+                    record = leaderboard.record(**payload)
+                    leaderboard.enrich(record, video_data(record.video_link))
+                    writer.write(record, task_id)
+            except Exception as e:
+                print(f"[{leaderboard.name} worker {worker_id}] Error on {kind} task {task_id}: {e}")
+                queue.fail(task_id, e)
+            progress.update()
+
+    errors = []
+
+    def run():
+        try:
+            work()
+        except Exception as e:
+            errors.append(e)
+
+    try:
+        threads = [threading.Thread(target=run, daemon=True) for _ in range(pool_size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            # Exit with an error so the monitor requeues what this worker still holds
+            raise errors[0]
+
+    finally:
+        # Keep the rows scraped so far even when the worker dies
+        writer.close()
+        print(f"[{leaderboard.name} worker {worker_id}] Time per phase:\n{timer.report()}")
+        if timings is not None:
+            timings.put(timer.summary())
+        if pool:
+            pool.close()
+        if board.get('driver'):
+            board['driver'].quit()
+
+
+def scrape_leaderboard(
+        leaderboard: Leaderboard,
+        n_workers: int = None,
+        queue_path: str = None,
+        seasons: tuple = None,
+        incremental: bool = False,
+        dataset: list = None,
+        max_restarts: int = 3,
+        backend: str = "selenium",
+        fixtures: str = None,
+        pool_size: int = 1,
+        limiter: RateLimiter = None,
+        position: int = 0,
+        output_format: str = "csv"
+):
+    """
+    Scrape a leaderboard with n_workers processes fed from one task queue,
+    restarting crashed workers while there is work left.
+
+    Args:
+        leaderboard: Leaderboard configuration.
+        n_workers: Number of worker processes, the leaderboard's default when None.
+        queue_path: SQLite task queue, the leaderboard's default when None.
+        seasons: (start, end) season range, the leaderboard's default when None.
+        incremental: Only load the seasons since the last stored attempt and skip stored attempts.
+        dataset: Stored CSVs of an incremental scrape, the leaderboard's dataset when None.
+        max_restarts: Number of crashed workers replaced.
+        backend: "selenium" or "http", which never starts a browser, see scrape_worker.
+        fixtures: Directory of saved pages for the http backend.
+        pool_size: Threads and browsers per worker.
+        limiter: RateLimiter shared with other leaderboards, one at POLITENESS_RATE when None.
+        position: First tqdm line of the workers.
+        output_format: "csv" or "parquet" for the worker files.
+
+    Raises:
+        Exception: The error of the leaderboard load when it fails and no
+            task of an earlier scrape is pending.
+    """
+    n_workers = n_workers or leaderboard.n_workers
+    queue_path = queue_path or leaderboard.queue_path()
+    seasons = seasons or leaderboard.seasons
+    limiter = limiter or RateLimiter()
+
+    known_play_ids = set()
+    since = ""
+    if incremental:
+        dataset = leaderboard.dataset if dataset is None else dataset
+        since, known_play_ids = load_known_attempts(list(dataset) + leaderboard.worker_files())
+        seasons = incremental_seasons(since, seasons)
+        print(f"[{leaderboard.name}] Incremental scrape of {seasons[0]}-{seasons[1]} since {since or 'the start'}, {len(known_play_ids)} attempts already stored.")
+
+    queue = TaskQueue(queue_path)
+    # Tasks left running by an interrupted scrape
+    queue.requeue()
+
+    timer = PhaseTimer()
+    timings = mp.Queue()
+    driver = None
+    try:
+        if backend != 'http':
+            driver = init_driver()
+        with timer('leaderboard', 'throttle'):
+            limiter.wait()
+        with timer('leaderboard', 'wait'):
+            if driver:
+                player_rows = load_leaderboard(driver, WebDriverWait(driver, 60), leaderboard, seasons)
+            else:
+                player_rows = fetch_leaderboard(http_backend(fixtures), leaderboard, seasons)
+        # Keyed by the selection, so a scrape with the same selection resumes and a new one starts over
+        selection = f"{seasons[0]}-{seasons[1]}:{since}"
+        queue.put('runner', [(f"{selection}:{i}", {'index': i}) for i in range(len(player_rows))])
+    except Exception as e:
+        print(f"[{leaderboard.name}] Failed to load the leaderboard: {e}")
+        if not queue.pending():
+            # Nothing left to resume either, workers on an empty queue would pass for a finished scrape
+            queue.close()
+            raise
+    finally:
+        if driver:
+            driver.quit()
+
+    print(f"[{leaderboard.name}] {queue.pending()} tasks pending.")
+
+    def start(worker_id):
+        p = mp.Process(
+            target=scrape_worker,
+            args=(leaderboard, worker_id, queue_path, seasons, known_play_ids, since, backend, fixtures, pool_size, limiter, position + worker_id, output_format, timings)
+        )
+        p.start()
+        time.sleep(1)
+        return p
+
+    processes = {i: start(i) for i in range(n_workers)}
+    restarts = 0
+    while processes:
+        for worker_id, p in list(processes.items()):
+            # Read while waiting, a worker only exits once what it put on the queue is read
+            while not timings.empty():
+                timer.merge(timings.get())
+            p.join(timeout=5)
+            if p.is_alive():
+                continue
+            del processes[worker_id]
+            if p.exitcode != 0:
+                # Hand the crashed worker's tasks to the others, and replace it while there is work left
+                requeued = queue.requeue(worker_id)
+                print(f"[{leaderboard.name}] Worker {worker_id} exited with code {p.exitcode}, {requeued} tasks requeued.")
+                if queue.pending() and restarts < max_restarts:
+                    restarts += 1
+                    processes[worker_id] = start(worker_id)
+
+    while not timings.empty():
+        timer.merge(timings.get())
+    print(f"[{leaderboard.name}] Time per phase over all workers:\n{timer.report()}")
+
+    for (kind, status), n in sorted(queue.counts().items()):
+        print(f"[{leaderboard.name}] {kind} {status}: {n}")
+    for kind, key, attempts, error in queue.dead_letters():
+        print(f"[{leaderboard.name}] [DEAD] {kind} {key} after {attempts} attempts: {error}")
+    queue.close()
+
+
+def scrape_all(leaderboards: list, rate: float = POLITENESS_RATE, **kwargs):
+    """
+    Scrape several leaderboards side by side, each with its own queue and
+    workers, all sharing one RateLimiter.
+
+    Args:
+        leaderboards: Leaderboard configurations.
+        rate: Requests per second shared by every worker, no limit when 0.
+        **kwargs: Arguments of scrape_leaderboard.
+
+    Raises:
+        RuntimeError: If a leaderboard failed, once every other one is done.
+    """
+    if kwargs.get('backend') == 'http':
+        # Imported before the threads fork their workers, a worker forked during the import would find it locked forever
+        import savant_http
+
+    limiter = RateLimiter(rate)
+    errors = {}
+
+    def run(leaderboard, **kwargs):
+        try:
+            scrape_leaderboard(leaderboard, **kwargs)
+        except Exception as e:
+            errors[leaderboard.name] = e
+
+    threads = []
+    position = 0
+    for leaderboard in leaderboards:
+        thread = threading.Thread(
+            target=run,
+            args=(leaderboard,),
+            kwargs={**kwargs, 'limiter': limiter, 'position': position},
+            name=leaderboard.name
+        )
+        thread.start()
+        threads.append(thread)
+        position += kwargs.get('n_workers') or leaderboard.n_workers
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise RuntimeError(f"Failed to scrape {', '.join(errors)}.") from next(iter(errors.values()))
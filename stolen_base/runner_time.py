@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+
+SPEED_SPLITS_FILE = Path(__file__).resolve().parent.parent / 'data' / 'speed_splits.csv'
+
+# Distances (ft) of the split columns in speed_splits.csv
+SPLIT_DISTANCES = np.arange(0, 95, 5)
+SPLIT_COLUMNS = [f'seconds_since_hit_{d:03d}' for d in SPLIT_DISTANCES]
+SPLIT_STEP = 5
+
+
+def load_speed_splits(file_path: Path = SPEED_SPLITS_FILE) -> pd.DataFrame:
+    """
+    Load the averaged sprint splits written by generate_splits_df.
+
+    Args:
+        file_path: Path to speed_splits.csv.
+
+    Returns:
+        DataFrame of the split columns indexed by runner_id, one row per runner.
+    """
+    splits = pd.read_csv(file_path)
+    splits = splits.drop_duplicates(subset='runner_id').set_index('runner_id')
+    return splits[SPLIT_COLUMNS]
+
+
+def calculate_runner_time(
+        runner_ids,
+        distances,
+        sprint_speeds,
+        splits: pd.DataFrame = None,
+        method: str = 'sprint'
+) -> np.ndarray:
+    """
+    Time for runners to cover a distance, from their 5 ft sprint splits.
+
+    The split of every runner at the closest distance at or below the target
+    is gathered in one indexed read. With method='sprint' the rest of the way
+    is covered at sprint speed, which is what the notebook's row-wise
+    calculate_runner_time does; with method='interpolate' the time is linearly
+    interpolated between the surrounding split columns. Runners without splits
+    and distances below the first split fall back to distance / sprint_speed.
+
+    Args:
+        runner_ids: MLBAM ids of the runners.
+        distances: Distances to cover in feet.
+        sprint_speeds: Sprint speeds in ft/s.
+        splits: Split table from load_speed_splits, loaded from SPEED_SPLITS_FILE when None.
+        method: "sprint" or "interpolate".
+
+    Returns:
+        Array of times in seconds, NaN where an input is missing.
+    """
+    if method not in ('sprint', 'interpolate'):
+        raise ValueError(f"Invalid method: {method}")
+
+    if splits is None:
+        splits = load_speed_splits()
+
+    runner_ids = np.asarray(runner_ids, dtype=float)
+    distances = np.asarray(distances, dtype=float)
+    sprint_speeds = np.asarray(sprint_speeds, dtype=float)
+
+    # load_speed_splits already keeps only the split columns, skip the costly column selection then
+    table = (splits if splits.columns.tolist() == SPLIT_COLUMNS else splits[SPLIT_COLUMNS]).to_numpy(dtype=float)
+    rows = splits.index.get_indexer(runner_ids)
+
+    last = len(SPLIT_DISTANCES) - 1
+    seg = np.clip(np.floor(np.nan_to_num(distances) / SPLIT_STEP), 0, last).astype(int)
+    has_split = (rows >= 0) & (distances >= SPLIT_DISTANCES[0])
+
+    safe_rows = np.where(has_split, rows, 0)
+    split_time = table[safe_rows, seg]
+    remaining = distances - SPLIT_DISTANCES[seg]
+
+    times = split_time + remaining / sprint_speeds
+    if method == 'interpolate':
+        next_time = table[safe_rows, np.minimum(seg + 1, last)]
+        inside = seg < last
+        times = np.where(inside, split_time + (next_time - split_time) * remaining / SPLIT_STEP, times)
+
+    times = np.where(has_split, times, distances / sprint_speeds)
+
+    missing = np.isnan(runner_ids) | np.isnan(distances) | np.isnan(sprint_speeds)
+    return np.where(missing, np.nan, times)
@@ -0,0 +1,190 @@
+import hashlib
+from pathlib import Path
+from urllib.parse import urljoin, urlparse, parse_qs
+
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+SAVANT_URL = "https://baseballsavant.mlb.com"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+
+def _has_class(name: str) -> str:
+    # XPath predicate matching one class among several
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def make_session(pool_size: int = 8, retries: int = 3) -> requests.Session:
+    """
+    requests session keeping up to pool_size connections to Savant alive and
+    retrying connection errors and 429/5xx responses with backoff.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET']
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+class FixtureResponse:
+    def __init__(self, url: str, text: str, status_code: int = 200):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for {self.url}")
+
+
+class FixtureSession:
+    """
+    Stand-in for a requests session serving saved pages from a directory, so
+    the HTTP backend can be run offline. A page is looked up as {playId}.html
+    for video pages and as the sha1 of the URL otherwise, see fixture_name.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def get(self, url: str, params: dict = None, timeout: float = None) -> FixtureResponse:
+        path = self.directory / fixture_name(url, params)
+        if not path.exists():
+            return FixtureResponse(url, "", 404)
+        return FixtureResponse(url, path.read_text(encoding='utf-8'))
+
+
+def fixture_name(url: str, params: dict = None) -> str:
+    """
+    File name of a saved page in a FixtureSession directory.
+    """
+    play_id = parse_qs(urlparse(url).query).get('playId')
+    if play_id:
+        return f"{play_id[0]}.html"
+    key = url + ('?' + '&'.join(f"{k}={v}" for k, v in sorted(params.items())) if params else '')
+    return hashlib.sha1(key.encode()).hexdigest() + '.html'
+
+
+def save_fixture(session: requests.Session, directory, url: str, params: dict = None) -> Path:
+    """
+    Download a page into a FixtureSession directory.
+    """
+    response = session.get(url, params=params, timeout=30)
+    response.raise_for_status()
+    path = Path(directory) / fixture_name(url, params)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(response.text, encoding='utf-8')
+    return path
+
+
+def parse_video_page(html: str) -> tuple:
+    """
+    Data of a sporty-videos page, the same elements leaderboard_scraper.read_video_page reads from the browser.
+
+    Returns:
+        Tuple of the description, the strike zone inner HTML and the values of the info bullets.
+
+    Raises:
+        ValueError: If the page has no video.
+    """
+    tree = lxml.html.fromstring(html)
+    if not tree.xpath("//*[@id='sporty_video']"):
+        raise ValueError("No sporty_video element in the page.")
+
+    headings = tree.xpath('//h3')
+    description = headings[0].text_content().strip() if headings else ""
+
+    zone = tree.xpath("//*[@id='zone_chart-zone']")
+    strike_zone = ""
+    if zone:
+        strike_zone = (zone[0].text or "") + ''.join(
+            lxml.html.tostring(child, encoding='unicode') for child in zone[0]
+        )
+
+    mods = tree.xpath(f"//*[{_has_class('mod')}]")
+    bullets = mods[-1].xpath('.//li') if mods else []
+    bullet_data = [b.text_content().split(":")[-1].strip() for b in bullets]
+
+    return description, strike_zone, bullet_data
+
+
+def parse_player_ids(html: str, table_id: str) -> list:
+    """
+    Player ids of the rows of a leaderboard table, read from the link to
+    each row's player page (/savant-player/{name}-{id}). Rows without one
+    are left out.
+
+    Raises:
+        ValueError: If the page has no table_id element.
+    """
+    tree = lxml.html.fromstring(html)
+    tables = tree.xpath(f"//*[@id='{table_id}']")
+    if not tables:
+        raise ValueError(f"No {table_id} element in the page.")
+
+    player_ids = []
+    for row in tables[0].xpath(f".//*[{_has_class('default-table-row')}]"):
+        links = row.xpath('.//a/@href')
+        player_id = links[0].rstrip('/').split('-')[-1] if links else ""
+        if player_id.isdigit():
+            player_ids.append(player_id)
+    return player_ids
+
+
+def parse_attempt_rows(html: str, base_url: str = SAVANT_URL) -> list:
+    """
+    Attempts of a leaderboard row, the same cells parse_sub_rows reads from
+    the row expanded in the browser.
+
+    Returns:
+        List of (values, video_link) per attempt.
+    """
+    tree = lxml.html.fromstring(html)
+    panes = tree.xpath(f"//*[{_has_class('all-tab-pane')}]") or [tree]
+
+    attempts = []
+    for pane in panes:
+        for row in pane.xpath(f".//*[{_has_class('default-table-row')}]"):
+            values = []
+            for span in row.xpath('.//span'):
+                links = span.xpath('.//a')
+                values.append(links[0].get('href', '').split('/')[-1] if links else span.text_content().strip())
+            links = row.xpath(f".//*[{_has_class('video-col')}]//a")
+            video_link = urljoin(base_url, links[0].get('href', '')) if links else ""
+            attempts.append((values, video_link))
+    return attempts
+
+
+class HttpBackend:
+    """
+    Fetches Savant pages over plain HTTP with a pooled session instead of a
+    browser tab. Pages are returned as served and parsed by the parse_*
+    functions, so the fetch and the parse can be timed apart.
+
+    Args:
+        session: requests session or FixtureSession, a pooled session by default.
+        timeout: Request timeout in seconds.
+    """
+
+    def __init__(self, session=None, timeout: float = 30):
+        self.session = session or make_session()
+        self.timeout = timeout
+
+    def get(self, url: str, params: dict = None) -> str:
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
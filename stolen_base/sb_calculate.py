@@ -1,10 +1,10 @@
+import numpy as np
 import pandas as pd
-from math import sqrt
 from scipy.stats import norm
 
 from pathlib import Path
 
-from utils import get_catchers_data, get_pitchers_pitch_data, get_player_speed
+from utils import get_pitchers_pitch_data, get_player_speed, get_pop_time_index
 
 from pybaseball import statcast_running_splits
 
@@ -23,14 +23,12 @@ def get_pop_time_stats(catcher_id: int, target_base: str) -> tuple:
         - Mean pop time in seconds.
         - Standard deviation of pop time in seconds.
     """
-    base_col = f'pop_{target_base.lower()}_sba'
+    pop_time_index = get_pop_time_index()
 
-    catcher_df = get_catchers_data(catcher_id)
+    catcher_df = pop_time_index.catcher_df(catcher_id)
+    mean_pop_time, std_dev_pop_time = pop_time_index.stats(catcher_id, target_base)
 
-    mean_pop_time = round(catcher_df[base_col].dropna().mean(), 3)
-    std_dev_pop_time = round(catcher_df[base_col].dropna().std(), 3)
-
-    return catcher_df, mean_pop_time, std_dev_pop_time
+    return catcher_df, round(mean_pop_time, 3), round(std_dev_pop_time, 3)
 
 
 def get_pitcher_windup_stats(pitcher_id: id) -> tuple:
@@ -146,34 +144,20 @@ def generate_pop_time_df(file_path: Path):
     sb_data = pd.read_csv(file_path)
 
     # Get unique catchers
-    players = set(sb_data['catcher_id'].unique().astype(int))
-
-    # Collect pop times for 3B
-    mu_pop_times_3b = []
-    for player in players:
-        _, time, _ = get_pop_time_stats(player, '3b')
-        mu_pop_times_3b.append(round(time, 3))
+    players = sorted(set(sb_data['catcher_id'].unique().astype(int)))
 
-    pop_time_3b_df = pd.DataFrame({
-        'catcher_id': list(players),
-        'target_base': ['3B'] * len(players),
-        'pop_time': mu_pop_times_3b
-    })
-
-    # Collect pop times for 2B
-    mu_pop_times_2b = []
-    for player in players:
-        _, time, _ = get_pop_time_stats(player, '2b')
-        mu_pop_times_2b.append(round(time, 3))
+    # Pop times for every catcher and base in one pass over the leaderboards
+    summary = get_pop_time_index().summary().set_index(['catcher_id', 'target_base'])['pop_time']
 
-    pop_time_2b_df = pd.DataFrame({
-        'catcher_id': list(players),
-        'target_base': ['2B'] * len(players),
-        'pop_time': mu_pop_times_2b
-    })
+    frames = []
+    for base in ('3B', '2B'):
+        frames.append(pd.DataFrame({
+            'catcher_id': players,
+            'target_base': [base] * len(players),
+            'pop_time': summary.reindex(pd.MultiIndex.from_product([players, [base]])).round(3).to_numpy()
+        }))
 
-    # Combine both
-    pop_time_df = pd.concat([pop_time_3b_df, pop_time_2b_df], ignore_index=True)
+    pop_time_df = pd.concat(frames, ignore_index=True)
 
     # Save to CSV
     pop_time_df.to_csv('/Users/robbykapua/Documents/GitHub/idea-lab/sb_probability/data/pop_time.csv', index=False)
@@ -207,6 +191,88 @@ def generate_splits_df():
 
 
 
+SB_PROBABILITY_COLUMNS = [
+    'mu_pop_time',
+    'sigma_pop_time',
+    'mu_pitcher_windup',
+    'sigma_pitcher_windup',
+    'mu_time_to_plate',
+    'sigma_time_to_plate',
+    'mu_time_to_base',
+    'sigma_time_to_base',
+    'mu_tag_time',
+    'sigma_tag_time',
+]
+
+
+def sb_probability_batch(
+        mu_pop_time,
+        sigma_pop_time,
+        mu_pitcher_windup,
+        sigma_pitcher_windup,
+        mu_time_to_plate,
+        sigma_time_to_plate,
+        mu_time_to_base,
+        sigma_time_to_base,
+        mu_tag_time,
+        sigma_tag_time
+) -> np.ndarray:
+    """
+    Calculate the probability of a successful stolen base attempt for many
+    attempts at once. Every argument may be a scalar or an array, and they are
+    broadcast against each other, so a single catcher/pitcher profile can be
+    scored against an array of runner times in one pass.
+
+    Args:
+        mu_pop_time: Mean pop time.
+        sigma_pop_time: Standard deviation of pop time.
+        mu_pitcher_windup: Mean pitcher windup time.
+        sigma_pitcher_windup: Standard deviation of pitcher windup time.
+        mu_time_to_plate: Mean time to plate given the pitch type of a pitcher
+        sigma_time_to_plate: Standard deviation of time to plate given the pitch type of a pitcher
+        mu_time_to_base: Mean time to base given the lead distance.
+        sigma_time_to_base: Standard deviation of time to base.
+        mu_tag_time: Mean tag time of the fielder.
+        sigma_tag_time: Standard deviation of tag time.
+
+    Returns:
+        Array of probabilities with the broadcast shape of the inputs.
+    """
+    mu_pop_time, sigma_pop_time = np.asarray(mu_pop_time, dtype=float), np.asarray(sigma_pop_time, dtype=float)
+    mu_pitcher_windup, sigma_pitcher_windup = np.asarray(mu_pitcher_windup, dtype=float), np.asarray(sigma_pitcher_windup, dtype=float)
+    mu_time_to_plate, sigma_time_to_plate = np.asarray(mu_time_to_plate, dtype=float), np.asarray(sigma_time_to_plate, dtype=float)
+    mu_time_to_base, sigma_time_to_base = np.asarray(mu_time_to_base, dtype=float), np.asarray(sigma_time_to_base, dtype=float)
+    mu_tag_time, sigma_tag_time = np.asarray(mu_tag_time, dtype=float), np.asarray(sigma_tag_time, dtype=float)
+
+    # Calculate the mean and variance of the defence time
+    m_defence_time = mu_pitcher_windup + mu_time_to_plate + mu_pop_time + mu_tag_time
+    var_defence_time = sigma_pitcher_windup ** 2 + sigma_time_to_plate ** 2 + sigma_pop_time ** 2 + sigma_tag_time ** 2
+
+    # Calculate chances of a successful stolen base
+    z = (m_defence_time - mu_time_to_base) / np.sqrt(var_defence_time + sigma_time_to_base ** 2)
+    p = norm.cdf(z)
+
+    return p
+
+
+def sb_probability_df(df: pd.DataFrame) -> np.ndarray:
+    """
+    Calculate the probability of a successful stolen base attempt for every row
+    of a DataFrame holding the mu/sigma columns named in SB_PROBABILITY_COLUMNS.
+
+    Args:
+        df: DataFrame with one column per sb_probability argument.
+
+    Returns:
+        Array of probabilities, one per row.
+    """
+    missing = [col for col in SB_PROBABILITY_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns for sb_probability: {', '.join(missing)}")
+
+    return sb_probability_batch(*(df[col].to_numpy(dtype=float) for col in SB_PROBABILITY_COLUMNS))
+
+
 def sb_probability(
         mu_pop_time: float,
         sigma_pop_time: float,
@@ -239,16 +305,15 @@ def sb_probability(
     Returns:
         Probability of a successful stolen base attempt.
     """
+    p = sb_probability_batch(
+        mu_pop_time, sigma_pop_time,
+        mu_pitcher_windup, sigma_pitcher_windup,
+        mu_time_to_plate, sigma_time_to_plate,
+        mu_time_to_base, sigma_time_to_base,
+        mu_tag_time, sigma_tag_time
+    )
 
-    # Calculate the mean and standard deviation of the defence time
-    m_defence_time = mu_pitcher_windup + mu_time_to_plate + mu_pop_time + mu_tag_time
-    sd_defence_time = sqrt(sigma_pitcher_windup ** 2 + sigma_time_to_plate ** 2 + sigma_pop_time ** 2 + sigma_tag_time ** 2)
-
-    # Calculate chances of a successful stolen base
-    z = (m_defence_time - mu_time_to_base) / sqrt(sd_defence_time ** 2 + sigma_time_to_base ** 2)
-    p = norm.cdf(z)
-
-    return p
+    return float(p)
 
 
 if __name__ == '__main__':
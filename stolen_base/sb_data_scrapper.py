@@ -1,18 +1,16 @@
-import time
-import random
-import pickle
-from pathlib import Path
-from dataclasses import dataclass
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
-from tqdm import tqdm
-import multiprocessing as mp
-import os
+from dataclasses import dataclass, replace
 
+# play_id and init_driver are imported from here by enrich and utils
+from leaderboard_scraper import (
+    DATA_DIR, POLITENESS_RATE, Leaderboard, RateLimiter, init_driver, play_id, scrape_leaderboard
+)
 
-@dataclass
+
+# Stored attempts an incremental scrape starts from
+DEFAULT_DATASET = sorted((DATA_DIR / 'sb_data_complete').glob('sb_data_*.csv'))
+
+
+@dataclass(slots=True)
 class SBData:
     date: str = ""
     catcher_name: str = ""
@@ -77,169 +75,51 @@ def upload_remaining_data(sbdata: SBData, data: list[str]):
     sbdata.velo = safe_get(data, 4)
     sbdata.match_up = safe_get(data, 7)
 
-def upload(data, filename):
-    file_exists = Path(filename).exists()
-    is_empty = not file_exists or Path(filename).stat().st_size == 0
-    mode = 'a' if file_exists and not is_empty else 'w'
-
-    with open(filename, mode) as file:
-        header = [field for field in SBData.__annotations__.keys()]
-        if mode == 'w':
-            file.write(','.join(header) + '\n')
-        for entry in data:
-            line = ','.join(str(getattr(entry, field)) for field in header)
-            file.write(line + '\n')
-
-def init_driver():
-    options = uc.ChromeOptions()
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-blink-features=AutomationControlled')
-    options.add_argument('--disable-infobars')
-    options.add_argument('--start-maximized')
-    options.add_argument('--disable-popup-blocking')
-    return uc.Chrome(options=options)
-
-def scrape_worker(worker_id, start_idx, end_idx, url, checkpoint=None):
-    checkpoint = f"checkpoint_{worker_id}.pkl" if checkpoint is None else checkpoint
-    file_path = f"sb_data_worker_{worker_id}.csv"
-
-    driver = init_driver()
-    wait = WebDriverWait(driver, 60)
-
-    try:
-        driver.get(url)
-        wait.until(EC.presence_of_element_located((By.ID, "ddlSeasonStart")))
-        Select(driver.find_element(By.ID, "ddlSeasonStart")).select_by_visible_text("2016")
-        Select(driver.find_element(By.ID, "ddlSeasonEnd")).select_by_visible_text("2021")
-        driver.find_element(By.ID, "btn-update").click()
-        wait.until(EC.presence_of_element_located((By.ID, "basestealing_running_game_table")))
-
-        if Path(checkpoint).exists() and os.path.getsize(checkpoint) > 0:
-            with open(checkpoint, "rb") as f:
-                sb_rows = pickle.load(f)
-            print(f"[Worker {worker_id}] Resuming from checkpoint with {len(sb_rows)} rows.")
-        else:
-            sb_rows = []
-
-            player_rows = driver.find_elements(By.CLASS_NAME, "default-table-row")
-            target_rows = player_rows[start_idx:end_idx]
-
-            for row in tqdm(target_rows, desc=f"Worker {worker_id} scraping", position=worker_id):
-                try:
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
-                    time.sleep(random.uniform(2, 4))
-                    driver.execute_script("arguments[0].click();", row)
-                    time.sleep(random.uniform(2, 4))
-                except:
-                    continue
-
-            time.sleep(3)
-            sub_data_rows = driver.find_elements(By.XPATH, "//tr[@class='tr-sub-data' and @data-open='true']")
-            for sub in tqdm(sub_data_rows, desc=f"Worker {worker_id} parsing rows", position=worker_id):
-                try:
-                    sub_data_div = sub.find_element(By.CLASS_NAME, "all-tab-pane")
-                    rows = sub_data_div.find_elements(By.CLASS_NAME, "default-table-row")
-                    for row in rows:
-                        spans = row.find_elements(By.TAG_NAME, "span")
-                        values = [s.text.strip() if not s.find_elements(By.TAG_NAME, "a") else s.find_element(By.TAG_NAME, "a").get_attribute("href").split("/")[-1] for s in spans]
-                        sb = SBData()
-                        upload_data(sb, values)
-                        try:
-                            sb.video_link = row.find_element(By.CLASS_NAME, "video-col").find_element(By.TAG_NAME, "a").get_attribute("href")
-                        except:
-                            sb.video_link = ""
-                        sb_rows.append(sb)
-                except:
-                    continue
-
-            with open(checkpoint, "wb") as f:
-                pickle.dump(sb_rows, f)
-
-        for i, sb in enumerate(tqdm(sb_rows, desc=f"Worker {worker_id} video scrape", position=worker_id)):
-            if not sb.video_link:
-                continue
-            try:
-                driver.execute_script("window.open(arguments[0]);", sb.video_link)
-                time.sleep(1)
-                if len(driver.window_handles) < 2:
-                    print(f"[Worker {worker_id}] Failed to open video window for link: {sb.video_link}")
-                    continue
-                # Switch to the newest window/tab
-                driver.switch_to.window(driver.window_handles[-1])
-                wait.until(EC.presence_of_element_located((By.ID, "sporty_video")))
-                sb.description = driver.find_element(By.TAG_NAME, "h3").text.strip().replace(',', '|')
-                sb.strike_zone = driver.find_element(By.ID, "zone_chart-zone").get_attribute("innerHTML")
-                bullets = driver.find_elements(By.CLASS_NAME, "mod")[-1].find_elements(By.TAG_NAME, "li")
-                bullet_data = [b.text.split(":")[-1].strip() for b in bullets]
-                upload_remaining_data(sb, bullet_data)
-            except Exception as e:
-                print(f"[Worker {worker_id}] Error while scraping video link: {e}")
-                continue
-            finally:
-                try:
-                    if len(driver.window_handles) > 1:
-                        driver.close()
-                        driver.switch_to.window(driver.window_handles[0])
-                except Exception as e:
-                    print(f"[Worker {worker_id}] Error during window close/switch: {e}")
-
-            upload([sb], file_path)
-            with open(checkpoint, "wb") as f:
-                pickle.dump(sb_rows[i + 1:], f)
-
-    finally:
-        driver.quit()
-
+def upload_video_data(sbdata: SBData, description: str, strike_zone: str, bullet_data: list[str]):
+    sbdata.description = description
+    sbdata.strike_zone = strike_zone
+    upload_remaining_data(sbdata, bullet_data)
+
+LEADERBOARD = Leaderboard(
+    name="sb",
+    url="https://baseballsavant.mlb.com/leaderboard/basestealing-run-value",
+    record=SBData,
+    parse_row=upload_data,
+    enrichments=(upload_video_data,),
+    seasons=(2016, 2025),
+    n_workers=2,
+    dataset=tuple(DEFAULT_DATASET),
+    attempts_url="https://baseballsavant.mlb.com/leaderboard/services/basestealing-run-value/{player_id}?game_type=All&season_start={season_start}&season_end={season_end}"
+)
 
 def main(
-        url = "https://baseballsavant.mlb.com/leaderboard/basestealing-run-value",
-        n_workers: int = 2,
-        checkpoints: list = None
+        url = LEADERBOARD.url,
+        n_workers: int = LEADERBOARD.n_workers,
+        queue_path: str = "sb_tasks.sqlite",
+        seasons: tuple = LEADERBOARD.seasons,
+        incremental: bool = False,
+        dataset: list = None,
+        max_restarts: int = 3,
+        backend: str = "selenium",
+        fixtures: str = None,
+        pool_size: int = 1,
+        rate: float = POLITENESS_RATE,
+        output_format: str = "csv"
 ):
-
-    try:
-        driver = init_driver()
-        wait = WebDriverWait(driver, 60)
-        driver.get(url)
-        wait.until(EC.presence_of_element_located((By.ID, "ddlSeasonStart")))
-        Select(driver.find_element(By.ID, "ddlSeasonStart")).select_by_visible_text("2016")
-        Select(driver.find_element(By.ID, "ddlSeasonEnd")).select_by_visible_text("2025")
-        driver.find_element(By.ID, "btn-update").click()
-        wait.until(EC.presence_of_element_located((By.ID, "basestealing_running_game_table")))
-    except Exception:
-        pass
-
-    player_rows = driver.find_elements(By.CLASS_NAME, "default-table-row")
-    total = len(player_rows)
-    driver.quit()
-
-    num_workers = n_workers if not checkpoints else len(checkpoints)
-    chunk_size = total // num_workers
-
-    processes = []
-    for i in range(num_workers):
-        # try to set up the worker 3 times if it fails
-        if i == num_workers - 1:
-            chunk_size = total - (chunk_size * i)
-        if chunk_size <= 0:
-            print(f"Chunk size for worker {i} is zero or negative, skipping.")
-            continue
-
-        print(f"Starting worker {i} with range {i * chunk_size} to {min((i + 1) * chunk_size, total)}")
-
-        start = i * chunk_size
-        end = min(start + chunk_size, total)
-        if checkpoints:
-            p = mp.Process(target=scrape_worker, args=(i, start, end, url, checkpoints[i]))
-        else:
-            p = mp.Process(target=scrape_worker, args=(i, start, end, url))
-        p.start()
-        processes.append(p)
-        time.sleep(1)
-
-    for p in processes:
-        p.join()
+    scrape_leaderboard(
+        replace(LEADERBOARD, url=url),
+        n_workers=n_workers,
+        queue_path=queue_path,
+        seasons=seasons,
+        incremental=incremental,
+        dataset=dataset,
+        max_restarts=max_restarts,
+        backend=backend,
+        fixtures=fixtures,
+        pool_size=pool_size,
+        limiter=RateLimiter(rate),
+        output_format=output_format
+    )
 
 if __name__ == '__main__':
     main(
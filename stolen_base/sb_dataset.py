@@ -0,0 +1,126 @@
+import pandas as pd
+from pathlib import Path
+
+from utils import DATA_DIR, load_csv
+
+
+PARQUET_DIR = DATA_DIR / 'sb_parquet'
+
+# Player columns hold names straight from the scraper and MLBAM ids once cleaned,
+# under either the SBData field name or the *_id name used after merging
+PLAYER_COLUMNS = [
+    'catcher_name', 'pitcher_name', 'runner_name', 'batter_name', 'fielder_name',
+    'catcher_id', 'pitcher_id', 'runner_id', 'batter_id', 'fielder_id',
+]
+
+# Typed schema of the SBData fields (and the 'call' column added by update_description)
+SB_SCHEMA = {
+    'date': 'datetime64[ns]',
+    'target_base': pd.CategoricalDtype(['2B', '3B', 'HP']),
+    'result': pd.CategoricalDtype(['SB', 'CS', 'BK', 'PK', 'FB']),
+    'runner_stealing_runs': 'float64',
+    'lead_distance_gained': 'float64',
+    'at_pitchers_first_move': 'float64',
+    'at_pitch_release': 'float64',
+    'ball_count': 'Int8',
+    'strike_count': 'Int8',
+    'pitch_type': 'category',
+    'velo': 'float64',
+    'description': 'string',
+    'call': pd.CategoricalDtype(['ball', 'strike', 'unknown']),
+    'match_up': 'string',
+    'strike_zone': 'string',
+    'video_link': 'string',
+}
+
+
+def _player_dtype(series: pd.Series):
+    numeric = pd.to_numeric(series.replace('--', pd.NA), errors='coerce')
+    if numeric.notna().sum() == series.replace('--', pd.NA).notna().sum():
+        return numeric.astype('Int64')
+    return series.astype('string').str.strip()
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast stolen base data to the typed schema. Player columns become nullable
+    integers when they only hold MLBAM ids and strings otherwise; '--' is read
+    as missing everywhere.
+
+    Args:
+        df: Stolen base data as loaded from CSV.
+
+    Returns:
+        DataFrame with typed columns and a 'season' column derived from the date.
+    """
+    df = df.replace('--', pd.NA)
+
+    for col in df.columns:
+        if col in PLAYER_COLUMNS:
+            df[col] = _player_dtype(df[col])
+        elif col == 'date':
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+        elif col in SB_SCHEMA:
+            dtype = SB_SCHEMA[col]
+            if dtype in ('float64', 'Int8'):
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
+            elif isinstance(dtype, pd.CategoricalDtype):
+                # Keep values outside the known categories instead of silently dropping them
+                values = df[col].astype('string').str.strip()
+                extra = sorted(set(values.dropna()) - set(dtype.categories))
+                df[col] = values.astype(pd.CategoricalDtype(list(dtype.categories) + extra))
+            else:
+                df[col] = df[col].astype(dtype)
+
+    df['season'] = df['date'].dt.year.fillna(0).astype('int16')
+    return df
+
+
+def to_parquet_dataset(df: pd.DataFrame, root: Path = PARQUET_DIR):
+    """
+    Write typed stolen base data as a Parquet dataset partitioned by season.
+
+    Args:
+        df: Stolen base data, typed with apply_schema.
+        root: Directory of the dataset.
+    """
+    # Replace the partitions being written instead of adding files next to the old ones
+    df.to_parquet(root, partition_cols=['season'], index=False, existing_data_behavior='delete_matching')
+
+
+def csv_to_parquet(file_paths: list, root: Path = PARQUET_DIR):
+    """
+    Convert stolen base CSVs into the season partitioned Parquet dataset.
+
+    Args:
+        file_paths: Paths to the CSV files.
+        root: Directory of the dataset.
+    """
+    df = pd.concat([load_csv(file_path) for file_path in file_paths], ignore_index=True)
+    df = apply_schema(df)
+    to_parquet_dataset(df, root)
+    print(f"Wrote {len(df)} rows for seasons {sorted(df['season'].unique().tolist())} to {root}.")
+
+
+def load_sb_data(columns: list = None, seasons: list = None, root: Path = PARQUET_DIR) -> pd.DataFrame:
+    """
+    Load stolen base data from the Parquet dataset, reading only the requested
+    columns and season partitions.
+
+    Args:
+        columns: Columns to read, all when None.
+        seasons: Seasons to read, all when None.
+        root: Directory of the dataset.
+
+    Returns:
+        DataFrame with typed columns.
+    """
+    filters = [('season', 'in', [int(season) for season in seasons])] if seasons is not None else None
+    return pd.read_parquet(root, columns=columns, filters=filters)
+
+
+if __name__ == '__main__':
+    csv_to_parquet([
+        DATA_DIR / 'sb_data_complete' / 'sb_data_2016-2021.csv',
+        DATA_DIR / 'sb_data_complete' / 'sb_data_2022-2025.csv'
+    ])
@@ -0,0 +1,217 @@
+import json
+import math
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy.stats import norm
+
+from sb_calculate import sb_probability_batch
+from sb_simulation import time_to_plate_samples
+from utils import DATA_DIR, get_pitcher_data, get_pop_time_index
+
+
+LOOKUP_DIR = DATA_DIR / 'lookup'
+
+# Lead distances at pitch release (ft) the probabilities are precomputed at
+DEFAULT_LEADS = np.arange(10.0, 45.0, 5.0)
+
+# Distance between bases in feet
+BASE_DISTANCE_FT = 90.0
+
+BASES = ['2B', '3B']
+
+# Probabilities are clipped to [PROBABILITY_FLOOR, 1 - PROBABILITY_FLOOR] so their z-scores stay finite
+PROBABILITY_FLOOR = 1e-12
+
+
+def pitcher_mix_stats(pitcher_ids: list) -> pd.DataFrame:
+    """
+    Mean and standard deviation of the time to plate over the whole pitch mix
+    of each pitcher, so every pitch type is weighted by how often it is thrown.
+
+    Args:
+        pitcher_ids: MLBAM ids of the pitchers.
+
+    Returns:
+        DataFrame with pitcher_id, mu_time_to_plate and sigma_time_to_plate.
+    """
+    rows = []
+    for pitcher_id in pitcher_ids:
+        try:
+            times = time_to_plate_samples(get_pitcher_data(pitcher_id))
+        except ValueError:
+            times = np.array([])
+        rows.append((
+            pitcher_id,
+            times.mean() if len(times) else np.nan,
+            times.std(ddof=1) if len(times) > 1 else np.nan
+        ))
+
+    return pd.DataFrame(rows, columns=['pitcher_id', 'mu_time_to_plate', 'sigma_time_to_plate'])
+
+
+def build_lookup_table(
+        path: Path,
+        runners: pd.DataFrame,
+        catchers: pd.DataFrame,
+        pitchers: pd.DataFrame,
+        leads: np.ndarray = DEFAULT_LEADS,
+        sigma_time_to_base: float = 0.1,
+        mu_pitcher_windup: float = 0.0,
+        sigma_pitcher_windup: float = 0.0,
+        mu_tag_time: float = 0.0,
+        sigma_tag_time: float = 0.0
+):
+    """
+    Precompute sb_probability for every (runner, catcher, pitcher, target base)
+    over a grid of lead distances and save it as a memory-mappable float16 array.
+
+    Probabilities are stored as z-scores (norm.ppf of the probability), which
+    are linear in the lead distance, so interpolating between grid leads on
+    read is exact for the closed form instead of cutting corners of the
+    S-shaped probability curve.
+
+    The table takes len(runners) * len(catchers) * len(pitchers) * 2 * len(leads)
+    * 2 bytes, e.g. about 360 MB for 400 runners, 80 catchers and 400 pitchers
+    with the default seven leads. Leads are measured at pitch release, so the
+    windup defaults to zero.
+
+    Args:
+        path: Directory to write the table to.
+        runners: DataFrame with runner_id and sprint_speed (ft/s), optionally sigma_time_to_base.
+        catchers: DataFrame with catcher_id, target_base, pop_time and pop_time_std, as PopTimeIndex.summary().
+        pitchers: DataFrame with pitcher_id, mu_time_to_plate and sigma_time_to_plate, as pitcher_mix_stats().
+        leads: Lead distances in feet.
+        sigma_time_to_base: Standard deviation of the runner time when runners has no such column.
+        mu_pitcher_windup: Mean pitcher windup time.
+        sigma_pitcher_windup: Standard deviation of pitcher windup time.
+        mu_tag_time: Mean tag time.
+        sigma_tag_time: Standard deviation of tag time.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    leads = np.asarray(leads, dtype=float)
+
+    runner_ids = runners['runner_id'].astype(int).tolist()
+    catcher_ids = sorted(catchers['catcher_id'].astype(int).unique().tolist())
+    pitcher_ids = pitchers['pitcher_id'].astype(int).tolist()
+
+    # Catcher pop times as (catcher, base), a missing spread falls back to the median spread
+    pop = catchers.pivot_table(index='catcher_id', columns='target_base', values=['pop_time', 'pop_time_std'], dropna=False)
+    pop = pop.reindex(index=catcher_ids, columns=pd.MultiIndex.from_product([['pop_time', 'pop_time_std'], BASES]))
+    mu_pop = pop['pop_time'].to_numpy(dtype=float)
+    sigma_pop = pop['pop_time_std'].to_numpy(dtype=float)
+    sigma_pop = np.where(np.isnan(sigma_pop), np.nanmedian(sigma_pop, axis=0), sigma_pop)
+
+    mu_plate = pitchers['mu_time_to_plate'].to_numpy(dtype=float)
+    sigma_plate = pitchers['sigma_time_to_plate'].to_numpy(dtype=float)
+
+    speed = runners['sprint_speed'].to_numpy(dtype=float)
+    sigma_runner = (
+        runners['sigma_time_to_base'].to_numpy(dtype=float)
+        if 'sigma_time_to_base' in runners.columns
+        else np.full(len(runners), sigma_time_to_base)
+    )
+
+    table = np.lib.format.open_memmap(
+        path / 'table.npy',
+        mode='w+',
+        dtype=np.float16,
+        shape=(len(runner_ids), len(catcher_ids), len(pitcher_ids), len(BASES), len(leads))
+    )
+
+    # One runner at a time keeps the float64 intermediate at catchers * pitchers * bases * leads
+    for i in range(len(runner_ids)):
+        p = sb_probability_batch(
+            mu_pop[:, None, :, None], sigma_pop[:, None, :, None],
+            mu_pitcher_windup, sigma_pitcher_windup,
+            mu_plate[None, :, None, None], sigma_plate[None, :, None, None],
+            (BASE_DISTANCE_FT - leads) / speed[i], sigma_runner[i],
+            mu_tag_time, sigma_tag_time
+        )
+        table[i] = norm.ppf(np.clip(p, PROBABILITY_FLOOR, 1 - PROBABILITY_FLOOR))
+
+    table.flush()
+    del table
+
+    with open(path / 'meta.json', 'w') as f:
+        json.dump({
+            'runner_ids': runner_ids,
+            'catcher_ids': catcher_ids,
+            'pitcher_ids': pitcher_ids,
+            'bases': BASES,
+            'leads': leads.tolist()
+        }, f)
+
+
+def build_league_table(runner_ids: list, catcher_ids: list, pitcher_ids: list, path: Path = LOOKUP_DIR, **kwargs):
+    """
+    Build the lookup table from player_speed.csv, the pop time leaderboards and
+    the pitch data of each pitcher.
+
+    Args:
+        runner_ids: MLBAM ids of the runners.
+        catcher_ids: MLBAM ids of the catchers.
+        pitcher_ids: MLBAM ids of the pitchers.
+        path: Directory to write the table to.
+        **kwargs: Passed on to build_lookup_table.
+    """
+    speed_df = pd.read_csv(DATA_DIR / 'player_speed.csv')
+    runners = speed_df[speed_df['runner_id'].isin(runner_ids)].drop_duplicates(subset='runner_id')
+
+    summary = get_pop_time_index().summary()
+    catchers = summary[summary['catcher_id'].isin(catcher_ids)]
+
+    pitchers = pitcher_mix_stats(pitcher_ids)
+
+    build_lookup_table(path, runners, catchers, pitchers, **kwargs)
+
+
+class SBLookupTable:
+    """
+    Read side of a table written by build_lookup_table. The array is memory
+    mapped and z-scores between grid leads are linearly interpolated, so a
+    query is a few dict lookups, one array read and one erf.
+    """
+
+    def __init__(self, path: Path = LOOKUP_DIR):
+        path = Path(path)
+        with open(path / 'meta.json', 'r') as f:
+            meta = json.load(f)
+
+        self.table = np.load(path / 'table.npy', mmap_mode='r')
+        self.leads = np.asarray(meta['leads'], dtype=float)
+        self.runners = {player_id: i for i, player_id in enumerate(meta['runner_ids'])}
+        self.catchers = {player_id: i for i, player_id in enumerate(meta['catcher_ids'])}
+        self.pitchers = {player_id: i for i, player_id in enumerate(meta['pitcher_ids'])}
+        self.bases = {base: i for i, base in enumerate(meta['bases'])}
+
+    def probability(self, runner_id: int, catcher_id: int, pitcher_id: int, target_base: str, lead: float) -> float:
+        """
+        Probability of a successful stolen base attempt.
+
+        Args:
+            runner_id: MLBAM ID of the runner.
+            catcher_id: MLBAM ID of the catcher.
+            pitcher_id: MLBAM ID of the pitcher.
+            target_base: "2B" or "3B".
+            lead: Lead distance at pitch release in feet, clamped to the grid.
+
+        Returns:
+            Probability of success.
+
+        Raises:
+            ValueError: If the runner, catcher, pitcher or base is not in the table.
+        """
+        try:
+            row = self.table[
+                self.runners[runner_id],
+                self.catchers[catcher_id],
+                self.pitchers[pitcher_id],
+                self.bases[target_base.upper()]
+            ]
+        except KeyError as e:
+            raise ValueError(f"{e.args[0]} is not in the lookup table.")
+
+        z = float(np.interp(lead, self.leads, row))
+        return 0.5 * (1 + math.erf(z / math.sqrt(2)))
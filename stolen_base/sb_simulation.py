@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from scipy.stats import norm
+
+
+# Distance from the mound to home plate in feet
+MOUND_TO_HOME_FT = 60.5
+
+# mph -> ft/s
+MPH_TO_FTS = 1.46667
+
+
+@dataclass
+class SimulationResult:
+    probability: float = 0.0
+    ci_low: float = 0.0
+    ci_high: float = 1.0
+    n_samples: int = 0
+
+
+def empirical_samples(df: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    Non-missing values of a column of one of the get_*_stats DataFrames.
+
+    Args:
+        df: DataFrame returned by a get_*_stats function.
+        column: Column holding the observations, e.g. 'pop_2b_sba'.
+
+    Returns:
+        1-D array of observations.
+    """
+    return pd.to_numeric(df[column], errors='coerce').dropna().to_numpy(dtype=float)
+
+
+def time_to_plate_samples(pitcher_df: pd.DataFrame, velo_loss: float = 2.0) -> np.ndarray:
+    """
+    Convert the release speeds of get_velocity_stats into times from mound to
+    plate, averaging release speed and plate speed to account for air drag.
+
+    Args:
+        pitcher_df: DataFrame returned by get_velocity_stats.
+        velo_loss: Velocity lost to air drag by the time the ball reaches the plate, in mph.
+
+    Returns:
+        1-D array of times to plate in seconds.
+    """
+    velo = empirical_samples(pitcher_df, 'release_speed')
+    avg_velo = (velo - velo_loss / 2) * MPH_TO_FTS
+    return MOUND_TO_HOME_FT / avg_velo
+
+
+def _draw(rng: np.random.Generator, source, n: int) -> np.ndarray:
+    """
+    Draw n samples of one timing component.
+
+    A scalar is used as a constant, a (mu, sigma) tuple is drawn from a normal
+    distribution and an array of observations is resampled with replacement.
+    """
+    if source is None:
+        return np.zeros(n)
+    if np.isscalar(source):
+        return np.full(n, float(source))
+    if isinstance(source, tuple) and len(source) == 2:
+        return rng.normal(source[0], source[1], n)
+
+    source = np.asarray(source, dtype=float)
+    if source.size == 0:
+        raise ValueError("Cannot sample from an empty distribution.")
+    return source[rng.integers(0, len(source), n)]
+
+
+def _draw_joint(rng: np.random.Generator, joint, n: int) -> np.ndarray:
+    """
+    Resample whole rows of jointly observed components and add them up, so
+    correlation between the components of a row is preserved.
+    """
+    joint = np.asarray(joint, dtype=float)
+    if joint.ndim == 1:
+        joint = joint[:, None]
+    rows = joint[rng.integers(0, len(joint), n)]
+    return rows.sum(axis=1)
+
+
+def wilson_interval(successes: int, n: int, confidence: float = 0.95) -> tuple:
+    """
+    Wilson score interval of a binomial proportion.
+
+    Args:
+        successes: Number of successes.
+        n: Number of trials.
+        confidence: Confidence level of the interval.
+
+    Returns:
+        Tuple of the lower and upper bound.
+    """
+    if n == 0:
+        return 0.0, 1.0
+
+    z = norm.ppf(0.5 + confidence / 2)
+    p = successes / n
+    denom = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denom
+    half = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denom
+    return max(0.0, float(center - half)), min(1.0, float(center + half))
+
+
+def simulate_sb_probability(
+        pop_time,
+        pitcher_windup,
+        time_to_plate,
+        time_to_base,
+        tag_time,
+        joint=None,
+        batch_size: int = 100_000,
+        max_samples: int = 2_000_000,
+        tol: float = 0.01,
+        confidence: float = 0.95,
+        seed: int = 42
+) -> SimulationResult:
+    """
+    Estimate the probability of a successful stolen base attempt by Monte Carlo
+    simulation instead of the Gaussian closed form of sb_probability.
+
+    Every component may be a scalar (constant), a (mu, sigma) tuple (normal)
+    or an array of observations (resampled with replacement), so skewed
+    empirical distributions are used as they are. Components observed together
+    can be passed as rows of `joint` instead, keeping their correlation.
+
+    Args:
+        pop_time: Pop time of the catcher.
+        pitcher_windup: Windup time of the pitcher.
+        time_to_plate: Time from mound to plate.
+        time_to_base: Time of the runner to the target base.
+        tag_time: Tag time of the fielder.
+        joint: Optional 2-D array of jointly observed defence components whose row sums are added to the defence time.
+        batch_size: Number of attempts simulated per batch.
+        max_samples: Maximum number of attempts simulated.
+        tol: Stop once the confidence interval is narrower than this.
+        confidence: Confidence level of the interval.
+        seed: Seed of the random generator.
+
+    Returns:
+        SimulationResult with the probability, its confidence interval and the number of samples.
+    """
+    rng = np.random.default_rng(seed)
+
+    successes = 0
+    n = 0
+    ci_low, ci_high = 0.0, 1.0
+
+    while n < max_samples:
+        size = min(batch_size, max_samples - n)
+
+        defence_time = (
+            _draw(rng, pitcher_windup, size)
+            + _draw(rng, time_to_plate, size)
+            + _draw(rng, pop_time, size)
+            + _draw(rng, tag_time, size)
+        )
+        if joint is not None:
+            defence_time += _draw_joint(rng, joint, size)
+
+        successes += int(np.count_nonzero(_draw(rng, time_to_base, size) < defence_time))
+        n += size
+
+        ci_low, ci_high = wilson_interval(successes, n, confidence)
+        if ci_high - ci_low < tol:
+            break
+
+    return SimulationResult(successes / n, ci_low, ci_high, n)
+
+
+def simulate_sb_probability_df(df: pd.DataFrame, samples: dict = None, **kwargs) -> pd.DataFrame:
+    """
+    Simulate every attempt of a DataFrame, e.g. all the attempts of a game.
+
+    Each row holds the components of one attempt under the argument names of
+    simulate_sb_probability. Cells may be scalars, (mu, sigma) tuples or arrays
+    of observations; `samples` maps a column to a dict of {cell value: observations}
+    so rows can refer to shared empirical distributions by key (e.g. catcher id).
+
+    Args:
+        df: One row per attempt.
+        samples: Optional lookup of empirical distributions per column.
+        **kwargs: Passed on to simulate_sb_probability.
+
+    Returns:
+        DataFrame with probability, ci_low, ci_high and n_samples per attempt.
+    """
+    samples = samples or {}
+    components = ['pop_time', 'pitcher_windup', 'time_to_plate', 'time_to_base', 'tag_time']
+
+    results = []
+    for row in df.itertuples(index=False):
+        args = {}
+        for col in components:
+            value = getattr(row, col, None)
+            args[col] = samples[col][value] if col in samples else value
+        results.append(simulate_sb_probability(**args, **kwargs))
+
+    return pd.DataFrame(
+        [(r.probability, r.ci_low, r.ci_high, r.n_samples) for r in results],
+        columns=['probability', 'ci_low', 'ci_high', 'n_samples'],
+        index=df.index
+    )
@@ -0,0 +1,43 @@
+import argparse
+
+import catcher_score_scrapper
+import sb_data_scrapper
+from leaderboard_scraper import FIXTURES_DIR, POLITENESS_RATE, scrape_all
+
+
+LEADERBOARDS = {
+    leaderboard.name: leaderboard
+    for leaderboard in (sb_data_scrapper.LEADERBOARD, catcher_score_scrapper.LEADERBOARD)
+}
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Scrape Savant leaderboards side by side.")
+    parser.add_argument('leaderboards', nargs='*', default=list(LEADERBOARDS), help=f"Any of {', '.join(LEADERBOARDS)}, all by default.")
+    parser.add_argument('--rate', type=float, default=POLITENESS_RATE, help="Requests per second shared by every leaderboard, 0 for no limit.")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes per leaderboard, each leaderboard's default when omitted.")
+    parser.add_argument('--pool-size', type=int, default=1)
+    parser.add_argument('--backend', default='selenium', choices=['selenium', 'http'])
+    parser.add_argument('--fixtures', default=None, help=f"Saved pages served to the http backend instead of Savant, e.g. {FIXTURES_DIR}.")
+    parser.add_argument('--format', default='csv', choices=['csv', 'parquet'], help="Format of the worker files.")
+    parser.add_argument('--incremental', action='store_true')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.leaderboards) - set(LEADERBOARDS)
+    if unknown:
+        parser.error(f"Unknown leaderboards: {', '.join(sorted(unknown))}")
+
+    scrape_all(
+        [LEADERBOARDS[name] for name in args.leaderboards],
+        rate=args.rate,
+        n_workers=args.workers,
+        pool_size=args.pool_size,
+        backend=args.backend,
+        fixtures=args.fixtures,
+        incremental=args.incremental,
+        output_format=args.format
+    )
+
+
+if __name__ == '__main__':
+    main()
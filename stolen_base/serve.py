@@ -0,0 +1,316 @@
+import sys
+import json
+import time
+import argparse
+import joblib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import optuna
+from sklearn.impute import KNNImputer
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.model_selection import train_test_split
+
+from features import (
+    DATA_DIR, IMPUTATION_FEATURES, TARGET_BASE_NUM,
+    FeaturePipeline, margin_features, pitch_features
+)
+from runner_time import calculate_runner_time, load_speed_splits
+from train import STUDY_STORAGE, make_model
+
+
+MODEL_DIR = DATA_DIR / 'models'
+
+# Number of recent score() calls the latency percentiles are computed over
+LATENCY_WINDOW = 10_000
+
+# Fields of one attempt, sprint_speed and pop_time are looked up when missing
+ATTEMPT_FIELDS = [
+    'runner_id', 'catcher_id', 'target_base', 'at_pitch_release', 'velo',
+    'pitch_type', 'ball_count', 'strike_count', 'sprint_speed', 'pop_time',
+]
+
+
+class AttemptFeatures:
+    """
+    The feature pipeline of features.py for raw attempts instead of the
+    scraped CSVs. Everything it needs from the training data (player speeds,
+    pop times, sprint splits, the fitted pop time imputer and the column
+    order of the feature matrix) is captured once so it can be pickled
+    with the model and applied to a batch without touching the disk.
+    """
+
+    def __init__(self, pipeline: FeaturePipeline = None):
+        pipeline = pipeline or FeaturePipeline()
+        self.constants = dict(pipeline.constants)
+
+        X, _ = pipeline.build()
+        self.columns = X.columns.tolist()
+
+        speed = pd.read_csv(pipeline.sources['player_speed']).dropna().drop_duplicates(subset='runner_id')
+        self.sprint_speed = dict(zip(speed['runner_id'].astype(int), speed['sprint_speed'].astype(float)))
+
+        pop = pd.read_csv(pipeline.sources['pop_time']).dropna()
+        self.pop_time = {
+            (int(catcher_id), base): float(pop_time)
+            for catcher_id, base, pop_time in pop[['catcher_id', 'target_base', 'pop_time']].itertuples(index=False)
+        }
+
+        self.splits = load_speed_splits(pipeline.sources['speed_splits'])
+
+        margin = pipeline.get('margin')
+        margin['target_base_num'] = margin['target_base'].map(TARGET_BASE_NUM)
+        self.imputer = KNNImputer(n_neighbors=5).fit(margin[IMPUTATION_FEATURES].to_numpy(dtype=float))
+
+    def transform(self, batch) -> np.ndarray:
+        """
+        Feature matrix of a batch of attempts.
+
+        Unlike the training pipeline, which drops attempts without a pop time,
+        a missing pop time is imputed before the time margin is computed.
+
+        Args:
+            batch: DataFrame or list of dicts with the ATTEMPT_FIELDS of each attempt.
+
+        Returns:
+            Float array of shape (len(batch), len(self.columns)), NaN where a feature cannot be computed.
+        """
+        if isinstance(batch, pd.DataFrame):
+            fields = {name: batch[name].tolist() for name in ATTEMPT_FIELDS if name in batch.columns}
+        else:
+            fields = {name: [attempt.get(name) for attempt in batch] for name in ATTEMPT_FIELDS}
+        n = len(batch)
+
+        def numeric(name):
+            values = fields.get(name)
+            return np.full(n, np.nan) if values is None else np.array(values, dtype=float)
+
+        def lookup(values, table, keys):
+            missing = np.isnan(values)
+            if missing.any():
+                values[missing] = [table.get(key, np.nan) for key, m in zip(keys, missing) if m]
+            return values
+
+        runner_ids = numeric('runner_id')
+        catcher_ids = numeric('catcher_id')
+        bases = [str(base).upper() for base in fields.get('target_base', [None] * n)]
+        pitch_types = np.array([str(pitch) for pitch in fields.get('pitch_type', [None] * n)])
+
+        release = numeric('at_pitch_release')
+        target_base_num = np.array([TARGET_BASE_NUM.get(base, np.nan) for base in bases])
+
+        runner_keys = [None if np.isnan(r) else int(r) for r in runner_ids]
+        catcher_keys = [None if np.isnan(c) else (int(c), base) for c, base in zip(catcher_ids, bases)]
+        sprint_speed = lookup(numeric('sprint_speed'), self.sprint_speed, runner_keys)
+        pop_time = lookup(numeric('pop_time'), self.pop_time, catcher_keys)
+
+        avg_velo, mound_to_home = pitch_features(numeric('velo'), self.constants['VELO_LOSS'])
+
+        missing = np.isnan(pop_time)
+        if missing.any():
+            imputation = np.column_stack([pop_time, avg_velo, release, target_base_num, mound_to_home])[missing]
+            pop_time[missing] = self.imputer.transform(imputation)[:, IMPUTATION_FEATURES.index('pop_time')]
+
+        reaction_time = self.constants['REACTION_TIME']
+        runner_to_target = calculate_runner_time(runner_ids, 90 - release, sprint_speed, self.splits) + reaction_time
+        ball_to_target, time_margin, runner_safe = margin_features(mound_to_home, pop_time, runner_to_target, reaction_time)
+
+        values = {
+            'at_pitch_release': release,
+            'ball_count': numeric('ball_count'),
+            'strike_count': numeric('strike_count'),
+            'sprint_speed': sprint_speed,
+            'pop_time': pop_time,
+            'runner_to_target': runner_to_target,
+            'avg_velo': avg_velo,
+            'ball_to_target': ball_to_target,
+            'time_margin': time_margin,
+            'runner_safe': np.where(np.isnan(time_margin), np.nan, runner_safe),
+            'target_base_num': target_base_num,
+        }
+
+        X = np.empty((n, len(self.columns)))
+        for i, col in enumerate(self.columns):
+            X[:, i] = values[col] if col in values else pitch_types == col[len('pitch_'):]
+        return X
+
+
+def export_scorer(model: str = 'xgb', params: dict = None, storage: str = STUDY_STORAGE, path: Path = None) -> Path:
+    """
+    Fit a model on the notebook's training split and save it with its
+    feature pipeline, so it can be served without the notebook.
+
+    Args:
+        model: "gb", "rf" or "xgb".
+        params: Hyperparameters, the best parameters of the model's study in storage when None.
+        storage: Optuna storage URL the study is read from.
+        path: File to save to, defaults to MODEL_DIR / {model}.joblib.
+
+    Returns:
+        Path of the saved scorer.
+    """
+    if params is None:
+        params = optuna.load_study(study_name=f"sb_{model}", storage=storage).best_params
+
+    pipeline = FeaturePipeline()
+    features = AttemptFeatures(pipeline)
+
+    X, y = pipeline.build()
+    X_train, X_test, y_train, y_test = train_test_split(
+        X.to_numpy(dtype=float), y.to_numpy(dtype=int), test_size=0.2, stratify=y, random_state=42
+    )
+
+    estimator = make_model(model, params).fit(X_train, y_train)
+    y_pred_proba = estimator.predict_proba(X_test)[:, 1]
+    print(f"{model}: test accuracy {accuracy_score(y_test, y_pred_proba > 0.5):.4f}, "
+          f"log loss {log_loss(y_test, y_pred_proba):.4f}")
+
+    path = Path(path) if path else MODEL_DIR / f"{model}.joblib"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump({'model': model, 'params': params, 'estimator': estimator, 'features': features}, path)
+    return path
+
+
+class Scorer:
+    """
+    A saved model and its feature pipeline, loaded once and kept warm.
+    """
+
+    def __init__(self, path: Path):
+        bundle = joblib.load(path)
+        self.model = bundle['model']
+        self.params = bundle['params']
+        self.estimator = bundle['estimator']
+        self.features = bundle['features']
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def score(self, batch) -> np.ndarray:
+        """
+        Probability of success of a batch of attempts.
+
+        Args:
+            batch: DataFrame or list of dicts with the ATTEMPT_FIELDS of each attempt.
+
+        Returns:
+            Array of probabilities, NaN for attempts missing a required field.
+        """
+        start = time.perf_counter()
+
+        X = self.features.transform(batch)
+        valid = np.isfinite(X).all(axis=1)
+        proba = np.full(len(X), np.nan)
+        if valid.any():
+            proba[valid] = self.estimator.predict_proba(X[valid])[:, 1]
+
+        self.latencies.append(time.perf_counter() - start)
+        return proba
+
+    def latency(self) -> dict:
+        """
+        Latency percentiles of the last LATENCY_WINDOW score() calls in milliseconds.
+        """
+        if not self.latencies:
+            return {'calls': 0, 'p50_ms': None, 'p99_ms': None}
+        p50, p99 = np.percentile(np.array(self.latencies) * 1000, [50, 99])
+        return {'calls': len(self.latencies), 'p50_ms': round(float(p50), 3), 'p99_ms': round(float(p99), 3)}
+
+
+def _respond(scorer: Scorer, request) -> dict:
+    # A request is one attempt or a list of attempts
+    if isinstance(request, list):
+        proba = scorer.score(request)
+        return {'probabilities': [None if np.isnan(p) else float(p) for p in proba]}
+    p = scorer.score([request])[0]
+    return {'probability': None if np.isnan(p) else float(p)}
+
+
+def serve_stdin(scorer: Scorer, stdin=sys.stdin, stdout=sys.stdout):
+    """
+    JSON lines front end: every input line is an attempt or a list of
+    attempts and is answered by one output line. The latency percentiles
+    are written to stderr at the end of the input.
+    """
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            response = _respond(scorer, json.loads(line))
+        except (ValueError, TypeError, KeyError) as e:
+            response = {'error': str(e)}
+        stdout.write(json.dumps(response) + '\n')
+        stdout.flush()
+
+    print(json.dumps(scorer.latency()), file=sys.stderr)
+
+
+def serve_http(scorer: Scorer, host: str = '127.0.0.1', port: int = 8000):
+    """
+    Local HTTP front end: POST /score with an attempt or a list of attempts,
+    GET /stats for the latency percentiles.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: dict):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == '/stats':
+                self._send(200, scorer.latency())
+            else:
+                self._send(404, {'error': f"Unknown path: {self.path}"})
+
+        def do_POST(self):
+            if self.path != '/score':
+                self._send(404, {'error': f"Unknown path: {self.path}"})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                self._send(200, _respond(scorer, request))
+            except (ValueError, TypeError, KeyError) as e:
+                self._send(400, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer((host, port), Handler)
+    print(f"Serving {scorer.model} on http://{host}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(scorer.latency()), file=sys.stderr)
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Serve stolen base probabilities.")
+    parser.add_argument('mode', choices=['export', 'stdin', 'http'])
+    parser.add_argument('--model', default='xgb', choices=['gb', 'rf', 'xgb'])
+    parser.add_argument('--path', type=Path, default=None)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    path = args.path or MODEL_DIR / f"{args.model}.joblib"
+    if args.mode == 'export':
+        print(export_scorer(args.model, path=path))
+        return
+
+    scorer = Scorer(path)
+    if args.mode == 'stdin':
+        serve_stdin(scorer)
+    else:
+        serve_http(scorer, args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from collections import OrderedDict
+
+
+# Cache directory, overridable so tests can point at a pre-seeded directory
+CACHE_DIR = Path(os.environ.get('SB_STATCAST_CACHE', Path(__file__).resolve().parent.parent / 'data' / 'cache'))
+
+# When set, a cache miss raises instead of hitting the network
+OFFLINE = os.environ.get('SB_STATCAST_OFFLINE', '') not in ('', '0')
+
+# Entries for the season in progress expire after this many seconds
+CURRENT_SEASON_TTL = 12 * 60 * 60
+
+# Number of frames kept in memory, the least recently used are dropped first
+MEMORY_ENTRIES = 32
+
+# Frames already read in this process, keyed by cache key, in least recently used order
+_memory = OrderedDict()
+
+
+def cache_key(endpoint: str, season: int, args: tuple = (), kwargs: dict = None) -> str:
+    """
+    Build the content address of a cached leaderboard fetch.
+
+    Args:
+        endpoint: Name of the pybaseball function.
+        season: Season the fetch belongs to.
+        args: Positional arguments passed to the function.
+        kwargs: Keyword arguments passed to the function.
+
+    Returns:
+        Hex digest identifying the fetch.
+    """
+    payload = json.dumps(
+        {'endpoint': endpoint, 'season': season, 'args': list(args), 'kwargs': kwargs or {}},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cache_path(key: str, cache_dir: Path = None) -> Path:
+    """
+    Path of the Parquet file holding a cache entry.
+    """
+    return Path(cache_dir or CACHE_DIR) / key[:2] / f"{key}.parquet"
+
+
+def is_fresh(path: Path, season: int) -> bool:
+    """
+    Check if a cache entry can be used. Closed seasons never expire, the
+    current season expires after CURRENT_SEASON_TTL.
+
+    Args:
+        path: Path of the cache entry.
+        season: Season the entry belongs to.
+
+    Returns:
+        True if the entry exists and is still valid.
+    """
+    if not path.exists():
+        return False
+    if season < datetime.today().year:
+        return True
+    return time.time() - path.stat().st_mtime < CURRENT_SEASON_TTL
+
+
+def cached_fetch(fetch, *args, season: int, cache_dir: Path = None, **kwargs) -> pd.DataFrame:
+    """
+    Call a pybaseball fetch function through the local on-disk cache.
+
+    Args:
+        fetch: pybaseball function to call, e.g. statcast_sprint_speed.
+        *args: Positional arguments for the function.
+        season: Season the fetch belongs to, used to pick the expiry policy.
+        cache_dir: Optional cache directory, defaults to CACHE_DIR.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        DataFrame returned by the function, read from cache when possible.
+    """
+    key = cache_key(fetch.__name__, season, args, kwargs)
+    path = cache_path(key, cache_dir)
+
+    if is_fresh(path, season):
+        if key not in _memory:
+            _remember(key, pd.read_parquet(path))
+        _memory.move_to_end(key)
+        return _memory[key].copy()
+
+    if OFFLINE:
+        raise LookupError(f"No cached {fetch.__name__} data for season {season} in {path.parent}.")
+
+    df = fetch(*args, **kwargs)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique per writer, so processes fetching the same key never share a temp file
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as tmp:
+        tmp_path = Path(tmp.name)
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    _remember(key, df)
+    return df.copy()
+
+
+def _remember(key: str, df: pd.DataFrame):
+    _memory[key] = df
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def clear_memory():
+    """
+    Drop the frames held in memory, forcing the next reads to go to disk.
+    """
+    _memory.clear()
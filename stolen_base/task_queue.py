@@ -0,0 +1,182 @@
+import json
+import time
+import sqlite3
+import threading
+from functools import wraps
+from contextlib import contextmanager
+from pathlib import Path
+
+
+# Number of failures after which a task is moved to the dead letters
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker INTEGER,
+    error TEXT,
+    updated REAL,
+    UNIQUE (kind, key)
+);
+CREATE INDEX IF NOT EXISTS tasks_pending ON tasks (status, priority DESC, id);
+"""
+
+
+def _locked(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class TaskQueue:
+    """
+    Work queue shared by scraper processes through a local SQLite file.
+
+    Workers claim one task at a time, so fast workers keep pulling work while
+    a slow one is busy instead of every worker owning a fixed chunk. A failed
+    task goes back to the queue until it has failed MAX_ATTEMPTS times and is
+    then kept as a dead letter with its last error. Tasks are unique per
+    (kind, key), so putting the same unit twice is a no-op and an interrupted
+    scrape resumes from the same file.
+    """
+
+    def __init__(self, path, max_attempts: int = MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        # One connection shared by the threads of a worker, every statement runs under the lock
+        self.conn = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        # The connection is in autocommit mode, so batches get an explicit transaction
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    @_locked
+    def put(self, kind: str, items: list, priority: int = 0) -> int:
+        """
+        Add tasks, skipping those already in the queue.
+
+        Args:
+            kind: Kind of task, e.g. "runner" or "video".
+            items: (key, payload) tuples, the payload must be JSON serializable.
+            priority: Tasks with a higher priority are claimed first.
+
+        Returns:
+            Number of tasks added.
+        """
+        now = time.time()
+        with self._transaction():
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO tasks (kind, key, payload, priority, updated) VALUES (?, ?, ?, ?, ?)",
+                [(kind, str(key), json.dumps(payload), priority, now) for key, payload in items]
+            )
+        return cursor.rowcount
+
+    @_locked
+    def claim(self, worker: int):
+        """
+        Take the next pending task.
+
+        Returns:
+            Tuple of (id, kind, payload), None when no task is pending.
+        """
+        with self._transaction():
+            row = self.conn.execute(
+                "SELECT id, kind, payload FROM tasks WHERE status = 'pending' ORDER BY priority DESC, id LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE tasks SET status = 'running', worker = ?, updated = ? WHERE id = ?",
+                    (worker, time.time(), row[0])
+                )
+
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    @_locked
+    def record(self, task_ids: list):
+        """
+        Mark tasks as done, in one transaction.
+        """
+        if not task_ids:
+            return
+        with self._transaction():
+            self.conn.executemany(
+                "UPDATE tasks SET status = 'done', error = NULL, updated = ? WHERE id = ?",
+                [(time.time(), task_id) for task_id in task_ids]
+            )
+
+    @_locked
+    def fail(self, task_id: int, error: str):
+        """
+        Count a failed attempt, the task is retried until it reaches max_attempts.
+        """
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE tasks SET attempts = attempts + 1, error = ?, updated = ?, "
+                "status = CASE WHEN attempts + 1 >= ? THEN 'dead' ELSE 'pending' END WHERE id = ?",
+                (str(error)[:1000], time.time(), self.max_attempts, task_id)
+            )
+
+    @_locked
+    def requeue(self, worker: int = None) -> int:
+        """
+        Put running tasks back in the queue, those of one worker or all of them,
+        e.g. after a worker crashed.
+
+        Returns:
+            Number of tasks requeued.
+        """
+        query = "UPDATE tasks SET status = 'pending', worker = NULL WHERE status = 'running'"
+        params = ()
+        if worker is not None:
+            query += " AND worker = ?"
+            params = (worker,)
+        with self._transaction():
+            return self.conn.execute(query, params).rowcount
+
+    @_locked
+    def pending(self) -> int:
+        """
+        Number of tasks pending or running.
+        """
+        return self.conn.execute("SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'running')").fetchone()[0]
+
+    @_locked
+    def counts(self) -> dict:
+        """
+        Number of tasks per kind and status.
+        """
+        rows = self.conn.execute("SELECT kind, status, COUNT(*) FROM tasks GROUP BY kind, status").fetchall()
+        return {(kind, status): n for kind, status, n in rows}
+
+    @_locked
+    def dead_letters(self) -> list:
+        """
+        Tasks that failed max_attempts times, as (kind, key, attempts, error).
+        """
+        return self.conn.execute(
+            "SELECT kind, key, attempts, error FROM tasks WHERE status = 'dead' ORDER BY id"
+        ).fetchall()
+
+    @_locked
+    def close(self):
+        self.conn.close()
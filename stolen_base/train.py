@@ -0,0 +1,263 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import optuna
+from xgboost import XGBClassifier
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import log_loss
+from sklearn.model_selection import train_test_split
+
+from features import DATA_DIR, build_features
+
+
+STUDY_STORAGE = f"sqlite:///{DATA_DIR / 'cache' / 'optuna.db'}"
+
+MODELS = ['gb', 'rf', 'xgb']
+
+# Trees added between two pruning checks
+PRUNING_STEP = 25
+
+
+def split_data(X: pd.DataFrame, y: pd.Series) -> tuple:
+    """
+    Train/test split of the notebook, plus a validation split carved out of
+    the training set so trials are scored and pruned without touching the test set.
+
+    Returns:
+        Tuple of X_train, X_valid, X_test, y_train, y_valid, y_test.
+    """
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+    X_train, X_valid, y_train, y_valid = train_test_split(
+        X_train, y_train, test_size=0.2, stratify=y_train, random_state=42
+    )
+    return X_train, X_valid, X_test, y_train, y_valid, y_test
+
+
+def suggest_params(trial: optuna.Trial, model: str, n_features: int) -> dict:
+    """
+    Hyperparameter search space of each model, as in the notebook.
+    """
+    if model == 'gb':
+        return {
+            'n_estimators': trial.suggest_int('n_estimators', 50, 250, step=50),
+            'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.2),
+            'max_depth': trial.suggest_int('max_depth', 3, 7),
+            'min_samples_split': trial.suggest_int('min_samples_split', 2, 10),
+            'min_samples_leaf': trial.suggest_int('min_samples_leaf', 1, 10),
+            'max_features': trial.suggest_int('max_features', 1, n_features - 1),
+            'subsample': trial.suggest_float('subsample', 0.5, 1.0)
+        }
+    if model == 'rf':
+        return {
+            'n_estimators': trial.suggest_int('n_estimators', 50, 250, step=50),
+            'max_depth': trial.suggest_int('max_depth', 3, 7),
+            'min_samples_split': trial.suggest_int('min_samples_split', 2, 10),
+            'min_samples_leaf': trial.suggest_int('min_samples_leaf', 1, 10),
+            'max_features': trial.suggest_int('max_features', 1, n_features - 1),
+            'bootstrap': trial.suggest_categorical('bootstrap', [True, False])
+        }
+    if model == 'xgb':
+        return {
+            'n_estimators': trial.suggest_int('n_estimators', 50, 250, step=50),
+            'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.2),
+            'max_depth': trial.suggest_int('max_depth', 3, 7),
+            'min_child_weight': trial.suggest_int('min_child_weight', 1, 10),
+            'gamma': trial.suggest_float('gamma', 0.0, 1.0),
+            'subsample': trial.suggest_float('subsample', 0.5, 1.0),
+            'colsample_bytree': trial.suggest_float('colsample_bytree', 0.5, 1.0),
+            'reg_alpha': trial.suggest_float('reg_alpha', 0.0, 1.0),
+            'reg_lambda': trial.suggest_float('reg_lambda', 0.0, 1.0)
+        }
+    raise ValueError(f"Invalid model: {model}")
+
+
+def make_model(model: str, params: dict):
+    """
+    Unfitted estimator of a model with the settings used by the notebook.
+    """
+    if model == 'gb':
+        return GradientBoostingClassifier(**params, validation_fraction=0.1, n_iter_no_change=5, random_state=42)
+    if model == 'rf':
+        return RandomForestClassifier(**params, random_state=42)
+    if model == 'xgb':
+        return XGBClassifier(**params, random_state=42)
+    raise ValueError(f"Invalid model: {model}")
+
+
+def fit_with_pruning(trial: optuna.Trial, model: str, params: dict, X_train, y_train, X_valid, y_valid) -> float:
+    """
+    Fit a trial's model, reporting the validation log loss every PRUNING_STEP
+    trees so unpromising trials are stopped early.
+
+    Returns:
+        Final validation log loss.
+    """
+    n_estimators = params['n_estimators']
+    steps = list(range(PRUNING_STEP, n_estimators, PRUNING_STEP)) + [n_estimators]
+
+    if model == 'gb':
+        # Scored while boosting, a pruned trial stops fitting at the step it is pruned at.
+        # A warm-started fit per step would restart the n_iter_no_change history every step.
+        state = {'pruned': False, 'loss': None}
+
+        def monitor(i, estimator, _):
+            if i == 0:
+                state['staged'] = estimator.staged_predict_proba(X_valid)
+            proba = next(state['staged'])
+            stage = i + 1
+            if stage % PRUNING_STEP and stage != n_estimators:
+                return False
+            state['loss'] = log_loss(y_valid, proba)
+            trial.report(state['loss'], stage)
+            state['pruned'] = trial.should_prune()
+            return state['pruned']
+
+        estimator = make_model(model, params).fit(X_train, y_train, monitor=monitor)
+        if state['pruned']:
+            raise optuna.TrialPruned()
+        loss = log_loss(y_valid, estimator.predict_proba(X_valid))
+        if estimator.n_estimators_ % PRUNING_STEP and estimator.n_estimators_ != n_estimators:
+            # Stopped early by n_iter_no_change between two reports
+            trial.report(loss, estimator.n_estimators_)
+        return loss
+
+    estimator = None
+    trees = 0
+    for step in steps:
+        if model == 'rf':
+            # Grow the forest in place
+            if estimator is None:
+                estimator = make_model(model, {**params, 'n_estimators': step})
+                estimator.set_params(warm_start=True)
+            else:
+                estimator.set_params(n_estimators=step)
+            estimator.fit(X_train, y_train)
+        else:
+            # Continue boosting from the previous booster
+            booster = estimator.get_booster() if estimator is not None else None
+            estimator = make_model(model, {**params, 'n_estimators': step - trees})
+            estimator.fit(X_train, y_train, xgb_model=booster)
+        trees = step
+
+        loss = log_loss(y_valid, estimator.predict_proba(X_valid))
+        trial.report(loss, step)
+        if trial.should_prune():
+            raise optuna.TrialPruned()
+
+    return loss
+
+
+def _save_shared(data_dir: Path, X_train, y_train, X_valid, y_valid):
+    np.save(data_dir / 'X_train.npy', np.asarray(X_train, dtype=float))
+    np.save(data_dir / 'y_train.npy', np.asarray(y_train, dtype=int))
+    np.save(data_dir / 'X_valid.npy', np.asarray(X_valid, dtype=float))
+    np.save(data_dir / 'y_valid.npy', np.asarray(y_valid, dtype=int))
+
+
+def _load_shared(data_dir: Path) -> dict:
+    # Memory-mapped, so every worker reads the same pages instead of a private copy
+    return {
+        name: np.load(data_dir / f"{name}.npy", mmap_mode='r')
+        for name in ('X_train', 'y_train', 'X_valid', 'y_valid')
+    }
+
+
+def _search_worker(model: str, study_name: str, storage: str, data_dir: str, n_trials: int, seed: int):
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    data = _load_shared(Path(data_dir))
+    n_features = data['X_train'].shape[1]
+
+    def objective(trial):
+        params = suggest_params(trial, model, n_features)
+        return fit_with_pruning(
+            trial, model, params,
+            data['X_train'], data['y_train'], data['X_valid'], data['y_valid']
+        )
+
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=storage,
+        sampler=optuna.samplers.TPESampler(seed=seed),
+        pruner=optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=PRUNING_STEP)
+    )
+    study.optimize(objective, n_trials=n_trials)
+
+
+def run_search(
+        model: str,
+        X_train: pd.DataFrame,
+        y_train: pd.Series,
+        X_valid: pd.DataFrame,
+        y_valid: pd.Series,
+        n_trials: int = 50,
+        n_workers: int = None,
+        storage: str = STUDY_STORAGE,
+        study_name: str = None
+) -> optuna.Study:
+    """
+    Run an Optuna search for one model across a pool of processes sharing a
+    SQLite-backed study, so an interrupted search resumes where it stopped and
+    several machines or sessions can add trials to the same study.
+
+    Args:
+        model: "gb", "rf" or "xgb".
+        X_train: Training features.
+        y_train: Training target.
+        X_valid: Validation features used to score and prune trials.
+        y_valid: Validation target.
+        n_trials: Total number of trials to run in this call.
+        n_workers: Number of worker processes, defaults to the number of cores.
+        storage: Optuna storage URL.
+        study_name: Name of the study, defaults to sb_{model}.
+
+    Returns:
+        The study, with best_params of every trial run so far.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    study_name = study_name or f"sb_{model}"
+
+    if storage.startswith('sqlite:///'):
+        Path(storage[len('sqlite:///'):]).parent.mkdir(parents=True, exist_ok=True)
+    optuna.create_study(study_name=study_name, storage=storage, direction='minimize', load_if_exists=True)
+
+    trials = [n_trials // n_workers + (1 if i < n_trials % n_workers else 0) for i in range(n_workers)]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        _save_shared(Path(data_dir), X_train=X_train, y_train=y_train, X_valid=X_valid, y_valid=y_valid)
+
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [
+                pool.submit(_search_worker, model, study_name, storage, data_dir, n, 42 + i)
+                for i, n in enumerate(trials) if n > 0
+            ]
+            for future in futures:
+                future.result()
+
+    return optuna.load_study(study_name=study_name, storage=storage)
+
+
+def run_all(n_trials: int = 50, n_workers: int = None, storage: str = STUDY_STORAGE) -> dict:
+    """
+    Run the searches of the three notebook models on the cached features.
+
+    Returns:
+        Dictionary of model name to best parameters.
+    """
+    X, y = build_features()
+    X_train, X_valid, _, y_train, y_valid, _ = split_data(X, y)
+
+    best_params = {}
+    for model in MODELS:
+        study = run_search(model, X_train, y_train, X_valid, y_valid, n_trials, n_workers, storage)
+        best_params[model] = study.best_params
+        print(f"{model}: best log loss {study.best_value:.4f} with {study.best_params}")
+
+    return best_params
+
+
+if __name__ == '__main__':
+    run_all()
@@ -1,9 +1,20 @@
+import io
+import os
 import csv
+import codecs
 import json
+import unicodedata
+import time
 import pickle
+import shutil
+import tempfile
 import chardet
+import numpy as np
 import pandas as pd
+from pathlib import Path
 from datetime import datetime
+from functools import lru_cache, wraps
+from collections import OrderedDict
 
 from tqdm import tqdm
 
@@ -13,8 +24,11 @@ from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 
 from sb_data_scrapper import init_driver
+from browser_pool import BrowserPool, BrowserSession
+from statcast_cache import cached_fetch
 
-from pybaseball import (playerid_lookup, playerid_reverse_lookup,
+from pybaseball import (playerid_lookup,
+                        chadwick_register,
                         statcast_catcher_poptime,
                         statcast_pitcher,
                         statcast_sprint_speed,
@@ -22,24 +36,226 @@ from pybaseball import (playerid_lookup, playerid_reverse_lookup,
                         )
 
 
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+
+
 # ---------------------------------------------------------------------------- #
 #                             Generate Player Data                             #
 # ---------------------------------------------------------------------------- #
 
 
-def generate_player_data(file_path: str):
-    ids = list(range(1, 900000))
-    players_df = playerid_reverse_lookup(ids, key_type='mlbam')
+REGISTRY_DIR = DATA_DIR / 'cache' / 'player_registry'
+
+# Separates first and last name inside the packed name buffer
+NAME_SEPARATOR = '\x1f'
+
 
-    players_df = players_df.dropna(subset=['name_first', 'name_last'])
+class PlayerRegistry:
+    """
+    Compact MLBAM id -> name table built from the Chadwick register.
+
+    Ids and name offsets are NumPy arrays and the names are one packed UTF-8
+    buffer, all memory-mapped on load. Entries are only ever appended, so
+    refresh() only encodes the new ids. Every refresh writes a complete new
+    version directory under REGISTRY_DIR and then swaps the CURRENT pointer
+    to it, so readers never see ids, offsets and names of different versions.
+    The previous version is kept until the next refresh, for readers that
+    read CURRENT just before the swap.
+    """
 
-    players_df['full_name'] = players_df['name_first'] + ' ' + players_df['name_last']
+    def __init__(self, directory: Path = REGISTRY_DIR):
+        self.directory = Path(directory)
+        self._open()
+
+    def _version_dir(self) -> Path:
+        current = self.directory / 'CURRENT'
+        if current.exists():
+            return self.directory / current.read_text().strip()
+        # Tables written before versioning live directly in the directory
+        return self.directory
+
+    def _open(self):
+        version_dir = self._version_dir()
+        ids_path = version_dir / 'ids.npy'
+        names_path = version_dir / 'names.bin'
+
+        if ids_path.exists():
+            self.ids = np.load(ids_path, mmap_mode='r')
+            self.offsets = np.load(version_dir / 'offsets.npy', mmap_mode='r')
+            self.order = np.load(version_dir / 'order.npy', mmap_mode='r')
+        else:
+            self.ids = np.empty(0, dtype=np.int64)
+            self.offsets = np.zeros(1, dtype=np.int64)
+            self.order = np.empty(0, dtype=np.int64)
+
+        if names_path.exists() and names_path.stat().st_size > 0:
+            self.names = np.memmap(names_path, dtype=np.uint8, mode='r')
+        else:
+            self.names = np.empty(0, dtype=np.uint8)
+
+        self.sorted_ids = self.ids[self.order]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, player_id) -> bool:
+        return self._position(player_id) is not None
+
+    def _position(self, player_id):
+        pos = np.searchsorted(self.sorted_ids, int(player_id))
+        if pos < len(self.sorted_ids) and self.sorted_ids[pos] == int(player_id):
+            return self.order[pos]
+        return None
+
+    def _decode(self, i: int) -> tuple:
+        raw = self.names[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+        first, last = raw.split(NAME_SEPARATOR)
+        return first, last
+
+    def refresh(self, register: pd.DataFrame = None) -> int:
+        """
+        Append the ids of the register that are not in the table yet.
+
+        Args:
+            register: Chadwick register, fetched through the Statcast cache when None.
+
+        Returns:
+            Number of ids added.
+        """
+        if register is None:
+            register = cached_fetch(chadwick_register, season=datetime.today().year)
+
+        register = register.dropna(subset=['key_mlbam', 'name_first', 'name_last'])
+        register = register[register['key_mlbam'] > 0].drop_duplicates(subset='key_mlbam')
+
+        new = register[~np.isin(register['key_mlbam'].to_numpy(dtype=np.int64), self.ids)]
+        if new.empty:
+            return 0
+
+        encoded = [
+            f"{first}{NAME_SEPARATOR}{last}".encode('utf-8')
+            for first, last in zip(new['name_first'], new['name_last'])
+        ]
+        ids = np.concatenate([self.ids, new['key_mlbam'].to_numpy(dtype=np.int64)])
+        offsets = np.concatenate([self.offsets, self.offsets[-1] + np.cumsum([len(name) for name in encoded])])
+
+        old_names = self.names[:int(self.offsets[-1])].tobytes()
+        previous = self._version_dir()
+
+        # The new version is written to a temporary directory and only renamed into place once complete
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.directory, prefix='.tmp-'))
+        try:
+            with open(tmp_dir / 'names.bin', 'wb') as f:
+                f.write(old_names + b''.join(encoded))
+            np.save(tmp_dir / 'offsets.npy', offsets)
+            np.save(tmp_dir / 'order.npy', np.argsort(ids, kind='stable'))
+            np.save(tmp_dir / 'ids.npy', ids)
 
-    players_df = players_df[['key_mlbam', 'name_first', 'name_last', 'full_name']]
+            version = f"v{len(ids):08d}"
+            try:
+                os.replace(tmp_dir, self.directory / version)
+            except OSError:
+                # A concurrent refresh already wrote the same version
+                if not (self.directory / version / 'ids.npy').exists():
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        with tempfile.NamedTemporaryFile('w', dir=self.directory, suffix='.tmp', delete=False) as f:
+            f.write(version)
+        os.replace(f.name, self.directory / 'CURRENT')
+
+        # The previous version is kept for readers that read CURRENT before the swap but have not loaded it yet
+        for old in self.directory.glob('v*'):
+            if old.is_dir() and old.name not in (version, previous.name):
+                # Open memory maps of old versions stay valid on POSIX, elsewhere the directory is left behind
+                shutil.rmtree(old, ignore_errors=True)
+
+        self._open()
+        return len(encoded)
+
+    def lookup(self, player_id: int) -> tuple:
+        """
+        Get the first and last name of a player.
+
+        Args:
+            player_id: Player's MLBAM ID.
+
+        Returns:
+            Tuple of first and last name.
+        """
+        i = self._position(player_id)
+        if i is None:
+            raise ValueError(f"Player {player_id} not found.")
+        return self._decode(i)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Decode the whole table.
+
+        Returns:
+            DataFrame with key_mlbam, name_first, name_last and full_name, sorted by id.
+        """
+        names = [self._decode(i) for i in self.order]
+        players_df = pd.DataFrame(names, columns=['name_first', 'name_last'])
+        players_df.insert(0, 'key_mlbam', self.sorted_ids)
+        players_df['full_name'] = players_df['name_first'] + ' ' + players_df['name_last']
+        return players_df
+
+    def annotate(self, df: pd.DataFrame, id_col: str) -> pd.DataFrame:
+        """
+        Add name_first and name_last columns for the ids in a column.
+
+        Args:
+            df: DataFrame to annotate.
+            id_col: Column holding MLBAM ids.
+
+        Returns:
+            DataFrame with the name columns added, NaN for unknown ids.
+        """
+        ids = pd.to_numeric(df[id_col], errors='coerce')
+        names = {
+            player_id: self._decode(i)
+            for player_id in ids.dropna().unique().astype(np.int64)
+            if (i := self._position(player_id)) is not None
+        }
+        df = df.copy()
+        df['name_first'] = ids.map(lambda player_id: names.get(player_id, (np.nan, np.nan))[0])
+        df['name_last'] = ids.map(lambda player_id: names.get(player_id, (np.nan, np.nan))[1])
+        return df
 
+
+@lru_cache(maxsize=None)
+def get_player_registry() -> PlayerRegistry:
+    """
+    Shared PlayerRegistry, built from the register on first use and refreshed
+    with new ids at most once per process.
+    """
+    registry = PlayerRegistry()
+    registry.refresh()
+    return registry
+
+
+def generate_player_data(file_path: str):
+    players_df = get_player_registry().to_frame()
     players_df.to_csv(file_path, index=False)
 
 
+def load_player_index(role: str) -> pd.DataFrame:
+    """
+    Load data/player_index/{role}_index.csv with the player names attached.
+
+    Args:
+        role: "batter", "catcher", "fielder", "pitcher" or "runner".
+
+    Returns:
+        DataFrame with the index, id and name columns.
+    """
+    index_df = pd.read_csv(DATA_DIR / 'player_index' / f'{role}_index.csv')
+    return get_player_registry().annotate(index_df, f'{role}_id')
+
+
 # ---------------------------------------------------------------------------- #
 #                             Required Runner Speed                            #
 # ---------------------------------------------------------------------------- #
@@ -83,17 +299,177 @@ def calculate_required_speed(
     return target_distance / (time_to_base - time_runner)
 
 
+# ---------------------------------------------------------------------------- #
+#                                 Lookup Cache                                 #
+# ---------------------------------------------------------------------------- #
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with hit and miss counters.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get(self, key, default=None):
+        if key in self.data:
+            self.data.move_to_end(key)
+            self.hits += 1
+            return self.data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def info(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.data), 'maxsize': self.maxsize}
+
+    def clear(self):
+        self.data.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_MISSING = object()
+
+
+def lru_lookup(maxsize: int = 4096, key=None):
+    """
+    Memoize a single-argument lookup in an LRUCache, exposed as the .cache
+    attribute of the wrapped function. Failed lookups are not cached.
+
+    Args:
+        maxsize: Maximum number of cached results.
+        key: Optional function normalizing the argument into the cache key.
+    """
+    def decorator(func):
+        cache = LRUCache(maxsize)
+
+        @wraps(func)
+        def wrapper(arg):
+            cache_key = key(arg) if key else arg
+            value = cache.get(cache_key, _MISSING)
+            if value is _MISSING:
+                value = func(arg)
+                cache.put(cache_key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
 # ---------------------------------------------------------------------------- #
 #                                 Data Cleaning                                #
 # ---------------------------------------------------------------------------- #
 
 
-def load_csv(file_path: str) -> pd.DataFrame:
+# Bytes sampled from the start of a file when guessing its encoding
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Detected encodings keyed by path, with the mtime and size of the file they were detected on
+ENCODING_MANIFEST = DATA_DIR / 'cache' / 'encodings.json'
+
+_encodings = None
+
+
+def _file_version(file_path: str) -> dict:
+    stat = os.stat(file_path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def _load_manifest() -> dict:
+    global _encodings
+    if _encodings is None:
+        try:
+            with open(ENCODING_MANIFEST, 'r') as f:
+                _encodings = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _encodings = {}
+        # Entries of the older path|mtime|size format are dropped
+        _encodings = {path: entry for path, entry in _encodings.items() if isinstance(entry, dict)}
+    return _encodings
+
+
+def _cached_encoding(file_path: str):
+    entry = _load_manifest().get(str(Path(file_path).resolve()))
+    if entry and {k: entry.get(k) for k in ('mtime_ns', 'size')} == _file_version(file_path):
+        return entry['encoding']
+    return None
+
+
+def _remember_encoding(file_path: str, encoding: str):
+    manifest = _load_manifest()
+    # One entry per path, a rewritten file replaces its entry
+    manifest[str(Path(file_path).resolve())] = {'encoding': encoding, **_file_version(file_path)}
+
+    ENCODING_MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', dir=ENCODING_MANIFEST.parent, suffix='.tmp', delete=False) as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f.name, ENCODING_MANIFEST)
+
+
+def detect_encoding(file_path: str) -> str:
+    """
+    Guess the encoding of a file from a bounded prefix. UTF-8 is tried first,
+    chardet is only run on the sample when the prefix is not valid UTF-8.
+
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        Name of the encoding.
+    """
     with open(file_path, 'rb') as f:
-        result = chardet.detect(f.read())
-        print(result)  # shows likely encoding
+        sample = f.read(ENCODING_SAMPLE_SIZE)
 
-    df = pd.read_csv(file_path, encoding=result['encoding'])
+    try:
+        # final=False tolerates a multi-byte character cut off at the end of the sample
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    return chardet.detect(sample)['encoding'] or 'utf-8'
+
+
+def load_csv(file_path: str) -> pd.DataFrame:
+    """
+    Load a CSV, detecting its encoding once and remembering it in the encoding
+    manifest so later loads of the unchanged file skip detection.
+
+    Args:
+        file_path: Path to the CSV file.
+
+    Returns:
+        DataFrame with the file content.
+    """
+    encoding = _cached_encoding(file_path)
+    if encoding:
+        return pd.read_csv(file_path, encoding=encoding)
+
+    encoding = detect_encoding(file_path)
+    try:
+        df = pd.read_csv(file_path, encoding=encoding)
+    except UnicodeDecodeError:
+        # The sample looked like UTF-8 but the rest of the file is not, fall back to a full detection
+        with open(file_path, 'rb') as f:
+            encoding = chardet.detect(f.read())['encoding']
+        df = pd.read_csv(file_path, encoding=encoding)
+
+    _remember_encoding(file_path, encoding)
     return df
 
 
@@ -115,9 +491,12 @@ def merge_csvs(file_paths: list, output_file: str):
     print(f"Merged {len(file_paths)} files into {output_file}.")
 
 
+@lru_lookup(key=str.strip)
 def lookup_player(player_name: str) -> str:
     """
-    Lookup MLBAM player ID from a formatted name "First|Last".
+    Lookup MLBAM player ID from a formatted name "First|Last". The name is
+    resolved by the shared NameResolver, like warm_lookup_cache, and only
+    falls back to playerid_lookup when the resolver does not know it.
 
     Args:
         player_name: Player name as "First|Last".
@@ -125,6 +504,10 @@ def lookup_player(player_name: str) -> str:
     Returns:
         MLBAM ID as string.
     """
+    ids = get_name_resolver().resolve(pd.Series([player_name]))
+    if ids.notna().iloc[0]:
+        return str(int(ids.iloc[0]))
+
     first, last = map(str.strip, player_name.split('|'))
     data = playerid_lookup(last=last.strip(), first=first.strip())
     if data.empty:
@@ -132,56 +515,162 @@ def lookup_player(player_name: str) -> str:
     return str(data.iloc[0]['key_mlbam'])
 
 
-def names_to_id(file_path: str, column: str, player_info: str = None):
+NAME_ID_MAP = DATA_DIR / 'name_id_map.json'
+
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+
+def normalize_name(first: str, last: str) -> str:
     """
-    Replace batter names with MLBAM player IDs in a CSV.
+    Build the lookup key of a player name, ignoring case, accents, punctuation
+    and generational suffixes, e.g. ("Luis", "García Jr.") -> "luis|garcia".
 
     Args:
-        file_path: Path to CSV file.
+        first: First name.
+        last: Last name.
+
+    Returns:
+        Normalized "first|last" key.
+    """
+    def clean(part) -> str:
+        part = unicodedata.normalize('NFKD', str(part)).encode('ascii', 'ignore').decode()
+        words = part.lower().replace('.', ' ').replace(',', ' ').split()
+        return ' '.join(word for word in words if word not in NAME_SUFFIXES)
+
+    return f"{clean(first)}|{clean(last)}"
+
+
+def full_name_key(name: str) -> str:
+    """
+    Lookup key of a whole player name, normalized like normalize_name but
+    without a first/last boundary, so "Matthew den Dekker" and
+    "Matthew | den Dekker" both give "matthew den dekker".
+    """
+    return normalize_name('', str(name).replace('|', ' ')).lstrip('|')
+
+
+class NameResolver:
+    """
+    Resolve player names to MLBAM ids against an in-memory index of the
+    Chadwick register, built once, then against the manual name_id_map.json
+    entries for the names it misses. The name map is only read, it stays the
+    hand-maintained list of names the register cannot resolve.
+    """
+
+    def __init__(self, register: pd.DataFrame = None, name_map_path: str = NAME_ID_MAP):
+        if register is None:
+            register = cached_fetch(chadwick_register, season=datetime.today().year)
+
+        register = register.dropna(subset=['key_mlbam', 'name_first', 'name_last'])
+        register = register[register['key_mlbam'] > 0]
+
+        # Most recent player first so shared names resolve to the active one
+        if 'mlb_played_last' in register.columns:
+            register = register.sort_values('mlb_played_last', ascending=False, na_position='last')
+
+        keys = [normalize_name(first, last) for first, last in zip(register['name_first'], register['name_last'])]
+        self.index = pd.Series(register['key_mlbam'].astype(int).to_numpy(), index=keys)
+        self.index = self.index[~self.index.index.duplicated(keep='first')]
+
+        self.name_map_path = Path(name_map_path) if name_map_path else None
+        self.name_map = {}
+        if self.name_map_path and self.name_map_path.exists():
+            with open(self.name_map_path, 'r') as f:
+                self.name_map = json.load(f)
+
+        # Keyed by the whole name, multi-word last names like "den Dekker" are why these entries exist
+        self.manual = pd.Series(
+            [int(player_id) for player_id in self.name_map.values()],
+            index=[full_name_key(name) for name in self.name_map.keys()],
+            dtype='int64'
+        )
+        self.manual = self.manual[~self.manual.index.duplicated()]
+
+    def resolve(self, names: pd.Series) -> pd.Series:
+        """
+        Resolve "First | Last" names to MLBAM ids in a single join against the
+        register index, then the names it misses against the manual entries.
+
+        Args:
+            names: Series of player names.
+
+        Returns:
+            Series of ids aligned with names, NaN where a name was not found.
+        """
+        unique = pd.Series(names.dropna().unique())
+        if unique.empty:
+            return names.map({})
+        parts = unique.astype(str).str.split('|', n=1, expand=True)
+        if parts.shape[1] < 2:
+            parts[1] = None
+
+        keys = [
+            normalize_name(first, last) if last is not None else None
+            for first, last in zip(parts[0], parts[1])
+        ]
+        ids = pd.Series(keys, index=unique.to_numpy()).map(self.index)
+        full_keys = pd.Series([full_name_key(name) for name in unique], index=unique.to_numpy())
+        ids = ids.fillna(full_keys.map(self.manual))
+        return names.map(ids)
+
+
+@lru_cache(maxsize=None)
+def get_name_resolver(name_map_path: str = NAME_ID_MAP) -> NameResolver:
+    """
+    Shared NameResolver, built on first use.
+    """
+    return NameResolver(name_map_path=name_map_path)
+
+
+def names_to_id_df(df: pd.DataFrame, column: str, player_info: str = None) -> pd.DataFrame:
+    """
+    Replace player names with MLBAM player IDs in a DataFrame.
+
+    Args:
+        df: DataFrame to update.
         column: Column name containing player names.
         player_info: Optional fallback dictionary of player names to IDs.
-    """
-    df = load_csv(file_path)
-    player_ids = {}
-    failed = []
 
-    for name in df[column].unique():
-        try:
-            player_ids[name] = lookup_player(name)
-        except Exception:
-            try:
-                first, last = map(str.strip, name.split('|'))
-                full_name = f"{first} {last}"
-            except Exception:
-                full_name = name
-            if player_info:
-                with open(player_info, 'r') as f:
-                    info = f.read()
-                    info = json.loads(info)
-            else:
-                info = None
-            fallback_id = info.get(full_name, name) if info else name
-            player_ids[name] = fallback_id
-            failed.append(name)
+    Returns:
+        The updated DataFrame.
+    """
+    resolver = get_name_resolver(player_info or NAME_ID_MAP)
+    ids = resolver.resolve(df[column])
 
+    failed = df.loc[ids.isna(), column].dropna().unique()
     print('Failed to lookup the following players:')
     for player in failed:
         if not str(player).isdigit():
             print(player)
 
-    df[column] = df[column].replace(player_ids)
-    df.to_csv(file_path, index=False)
+    df[column] = ids.astype('Int64').astype(str).where(ids.notna(), df[column])
+    return df
 
 
-def update_description(file_path: str):
+def names_to_id(file_path: str, column: str, player_info: str = None):
     """
-    Simplify pitch descriptions to 'ball', 'strike', or 'unknown'.
+    Replace batter names with MLBAM player IDs in a CSV.
 
     Args:
-        file_path: Path to the CSV.
+        file_path: Path to CSV file.
+        column: Column name containing player names.
+        player_info: Optional fallback dictionary of player names to IDs.
     """
     df = load_csv(file_path)
+    df = names_to_id_df(df, column, player_info)
+    df.to_csv(file_path, index=False)
+
+
+def update_description_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Simplify pitch descriptions to 'ball', 'strike', or 'unknown'.
+
+    Args:
+        df: DataFrame to update.
 
+    Returns:
+        The updated DataFrame.
+    """
     def simplify(desc):
         try:
             desc_lower = desc.lower()
@@ -195,9 +684,35 @@ def update_description(file_path: str):
 
     df['call'] = df['description'].apply(simplify)
     df.drop(columns=['description'], inplace=True)
+    return df
+
+
+def update_description(file_path: str):
+    """
+    Simplify pitch descriptions to 'ball', 'strike', or 'unknown'.
+
+    Args:
+        file_path: Path to the CSV.
+    """
+    df = load_csv(file_path)
+    df = update_description_df(df)
     df.to_csv(file_path, index=False)
 
 
+def remove_duplicates_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Remove duplicate rows from a DataFrame.
+
+    Args:
+        df: DataFrame to update.
+
+    Returns:
+        The updated DataFrame.
+    """
+    df.drop_duplicates(inplace=True)
+    return df
+
+
 def remove_duplicates(file_path: str):
     """
     Remove duplicate rows from a CSV, preserving the header.
@@ -208,11 +723,26 @@ def remove_duplicates(file_path: str):
     df = load_csv(file_path)
 
     # Remove duplicate rows
-    df.drop_duplicates(inplace=True)
+    df = remove_duplicates_df(df)
 
     # Save the updated DataFrame back to the CSV file
     df.to_csv(file_path, index=False)
 
+
+def update_nan_values_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Replaces '--' with NaN values in a DataFrame.
+
+    Args:
+        df: DataFrame to update.
+
+    Returns:
+        The updated DataFrame.
+    """
+    df.replace('--', pd.NA, inplace=True)
+    return df
+
+
 def update_nan_values(file_path: str):
     """
     Replaces '--' with NaN values in a CSV file.
@@ -223,12 +753,36 @@ def update_nan_values(file_path: str):
     df = load_csv(file_path)
 
     # Replace '--' with NaN
-    df.replace('--', pd.NA, inplace=True)
+    df = update_nan_values_df(df)
 
     # Save the updated DataFrame back to the CSV file
     df.to_csv(file_path, index=False)
 
 
+DROP_ROWS_COLUMNS = [
+    'pitcher_name',
+    'catcher_name',
+    'runner_name',
+    'lead_distance_gained',
+    'at_pitchers_first_move',
+    'at_pitch_release'
+]
+
+
+def drop_rows_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop rows with NaN values in any of the DROP_ROWS_COLUMNS.
+
+    Args:
+        df: DataFrame to update.
+
+    Returns:
+        The updated DataFrame.
+    """
+    df.dropna(subset=DROP_ROWS_COLUMNS, inplace=True)
+    return df
+
+
 def drop_rows(file_path: str):
     """
     Drop rows with NaN values in 'pitcher_name', 'catcher_name', 'runner_name',
@@ -238,18 +792,26 @@ def drop_rows(file_path: str):
         file_path: Path to the CSV file.
     """
     df = load_csv(file_path)
+    df = drop_rows_df(df)
+    df.to_csv(file_path, index=False)
 
-    columns_to_check = [
-        'pitcher_name',
-        'catcher_name',
-        'runner_name',
-        'lead_distance_gained',
-        'at_pitchers_first_move',
-        'at_pitch_release'
-    ]
-    df.dropna(subset=columns_to_check, inplace=True)
 
-    df.to_csv(file_path, index=False)
+def clean_whitespace_df(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """
+    Clean leading and trailing whitespace from specified columns in a DataFrame.
+
+    Args:
+        df: DataFrame to update.
+        columns: List of column names to clean.
+
+    Returns:
+        The updated DataFrame.
+    """
+    for col in columns:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.strip()
+
+    return df
 
 
 def clean_whitespace(file_path: str, columns: list):
@@ -261,12 +823,118 @@ def clean_whitespace(file_path: str, columns: list):
         columns: List of column names to clean.
     """
     df = load_csv(file_path)
+    df = clean_whitespace_df(df, columns)
+    df.to_csv(file_path, index=False)
 
-    for col in columns:
-        if col in df.columns:
-            df[col] = df[col].astype(str).str.strip()
 
-    df.to_csv(file_path, index=False)
+class CleaningPipeline:
+    """
+    Ordered list of DataFrame cleaning steps that loads a CSV once, applies
+    every step in memory and writes the result once.
+
+    With roundtrip enabled (the default) the frame is serialized and re-parsed
+    in memory after each step, reproducing the dtype changes the file based
+    helpers get from rewriting and reloading the CSV, so the output is
+    byte-identical to running those helpers one after another.
+    """
+
+    def __init__(self, steps: list = None, roundtrip: bool = True):
+        self.steps = list(steps) if steps else []
+        self.roundtrip = roundtrip
+
+    def add(self, func, *args, name: str = None, **kwargs) -> 'CleaningPipeline':
+        """
+        Append a step taking a DataFrame as first argument and returning the updated DataFrame.
+
+        Args:
+            func: Step function, e.g. remove_duplicates_df.
+            *args: Extra positional arguments for the step.
+            name: Optional name used in the timing output.
+            **kwargs: Extra keyword arguments for the step.
+
+        Returns:
+            The pipeline, so calls can be chained.
+        """
+        self.steps.append((name or func.__name__, func, args, kwargs))
+        return self
+
+    @staticmethod
+    def _reparse(df: pd.DataFrame) -> pd.DataFrame:
+        # Numeric columns survive a CSV round trip unchanged, so only the text columns are re-parsed
+        df = df.reset_index(drop=True)
+        text_cols = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])]
+        if text_cols:
+            parsed = pd.read_csv(io.StringIO(df[text_cols].to_csv(index=False)))
+            for col in text_cols:
+                df[col] = parsed[col]
+        return df
+
+    def run_df(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply every step to a DataFrame, printing the time spent on each.
+
+        Args:
+            df: DataFrame to clean.
+
+        Returns:
+            The cleaned DataFrame.
+        """
+        total_start = time.perf_counter()
+
+        for name, func, args, kwargs in self.steps:
+            start = time.perf_counter()
+            df = func(df, *args, **kwargs)
+            if self.roundtrip:
+                df = self._reparse(df)
+            print(f"{name}: {time.perf_counter() - start:.3f}s ({len(df)} rows)")
+
+        print(f"Total: {time.perf_counter() - total_start:.3f}s")
+        return df
+
+    def run(self, file_path: str, output_file: str = None) -> pd.DataFrame:
+        """
+        Load a CSV, apply every step and write the result.
+
+        Args:
+            file_path: Path to the CSV file.
+            output_file: Path to save the cleaned CSV, defaults to overwriting file_path.
+
+        Returns:
+            The cleaned DataFrame.
+        """
+        start = time.perf_counter()
+        df = load_csv(file_path)
+        print(f"load_csv: {time.perf_counter() - start:.3f}s ({len(df)} rows)")
+
+        df = self.run_df(df)
+
+        start = time.perf_counter()
+        df.to_csv(output_file or file_path, index=False)
+        print(f"to_csv: {time.perf_counter() - start:.3f}s")
+
+        return df
+
+
+def default_cleaning_pipeline(player_info: str = None) -> CleaningPipeline:
+    """
+    Build the cleaning recipe applied to freshly scraped stolen base data.
+
+    Args:
+        player_info: Optional fallback dictionary of player names to IDs.
+
+    Returns:
+        CleaningPipeline with the steps in the order they are run on the data.
+    """
+    return (
+        CleaningPipeline()
+        .add(remove_duplicates_df)
+        .add(update_nan_values_df)
+        .add(drop_rows_df)
+        .add(clean_whitespace_df, ['batter_name', 'pitcher_name', 'fielder_name', 'catcher_name', 'runner_name'])
+        .add(names_to_id_df, 'batter_name', player_info, name='names_to_id_df(batter_name)')
+        .add(names_to_id_df, 'pitcher_name', player_info, name='names_to_id_df(pitcher_name)')
+        .add(update_description_df)
+    )
 
 
 # ---------------------------------------------------------------------------- #
@@ -309,6 +977,7 @@ def pkl_content(file_path: str):
         raise ValueError(f"Error reading the pkl file: {e}")
 
 
+@lru_lookup(key=int)
 def get_name_from_id(player_id: int) -> str:
     """
     Get player name from MLBAM ID.
@@ -319,27 +988,213 @@ def get_name_from_id(player_id: int) -> str:
     Returns:
         Player's last, first name.
     """
-    df = playerid_reverse_lookup([player_id])
-    first = df.iloc[0]['name_first']
-    last = df.iloc[0]['name_last']
+    first, last = get_player_registry().lookup(player_id)
     return f"{last}, {first}"
 
+
+def warm_name_cache(player_ids: list) -> int:
+    """
+    Pre-populate the get_name_from_id cache from a list of ids in one registry pass.
+
+    Args:
+        player_ids: MLBAM ids to load.
+
+    Returns:
+        Number of ids found and cached.
+    """
+    registry = get_player_registry()
+    names = registry.annotate(pd.DataFrame({'player_id': pd.unique(pd.Series(player_ids))}), 'player_id').dropna()
+    for player_id, first, last in zip(names['player_id'], names['name_first'], names['name_last']):
+        get_name_from_id.cache.put(int(player_id), f"{last}, {first}")
+    return len(names)
+
+
+def warm_lookup_cache(player_names: list) -> int:
+    """
+    Pre-populate the lookup_player cache from a list of "First|Last" names in
+    one join against the NameResolver index, the same resolution a cold
+    lookup_player call goes through first. Names the resolver does not know
+    are left to lookup_player's playerid_lookup fallback.
+
+    Args:
+        player_names: Player names to resolve.
+
+    Returns:
+        Number of names resolved and cached.
+    """
+    names = pd.Series(pd.unique(pd.Series(player_names).dropna()))
+    ids = get_name_resolver().resolve(names)
+    for name, player_id in zip(names[ids.notna()], ids.dropna()):
+        lookup_player.cache.put(str(name).strip(), str(int(player_id)))
+    return int(ids.notna().sum())
+
 # ---------------------------------------------------------------------------- #
 #                                 Mean Helpers                                 #
 # ---------------------------------------------------------------------------- #
 
 
+POP_TIME_BASES = {'2b': '2b', 'second': '2b', '3b': '3b', 'third': '3b'}
+
+
+class PopTimeIndex:
+    """
+    In-memory index over the catcher pop time leaderboards of several seasons.
+
+    Every season is loaded once and the season averages of each catcher are
+    stored per base as cumulative sums, so the mean and standard deviation over
+    any window of seasons is answered without scanning the leaderboard.
+    """
+
+    def __init__(self, seasons: list = None):
+        seasons = list(range(2016, 2026)) if seasons is None else list(seasons)
+
+        frames = []
+        for year in seasons:
+            df = cached_fetch(statcast_catcher_poptime, year, season=year, min_2b_att=0, min_3b_att=0)
+            frames.append(df.assign(season=year))
+
+        self.df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        self._rows = {
+            int(catcher_id): rows.index.to_numpy()
+            for catcher_id, rows in self.df.groupby('entity_id')
+        } if not self.df.empty else {}
+
+        # (catcher_id, base) -> (seasons, cumulative count, cumulative sum, cumulative sum of squares)
+        self._stats = {}
+        for base in ('2b', '3b'):
+            col = f'pop_{base}_sba'
+            if col not in self.df.columns:
+                continue
+            base_df = self.df[['entity_id', 'season', col]].dropna().sort_values(['entity_id', 'season'])
+            for catcher_id, rows in base_df.groupby('entity_id'):
+                values = rows[col].to_numpy(dtype=float)
+                self._stats[(int(catcher_id), base)] = (
+                    rows['season'].to_numpy(),
+                    np.arange(1, len(values) + 1),
+                    np.cumsum(values),
+                    np.cumsum(values ** 2)
+                )
+
+    def catcher_df(self, catcher_id: int) -> pd.DataFrame:
+        """
+        Return every leaderboard row of a catcher.
+
+        Args:
+            catcher_id: MLBAM ID of the catcher.
+
+        Returns:
+            DataFrame with one row per season the catcher appears in.
+        """
+        rows = self._rows.get(int(catcher_id))
+        if rows is None:
+            return self.df.iloc[0:0]
+        return self.df.loc[rows]
+
+    def stats(self, catcher_id: int, target_base: str, start: int = None, end: int = None) -> tuple:
+        """
+        Mean and standard deviation of a catcher's pop time over a window of seasons.
+
+        Args:
+            catcher_id: MLBAM ID of the catcher.
+            target_base: "2b"/"second" or "3b"/"third".
+            start: First season of the window, inclusive. Defaults to the first loaded season.
+            end: Last season of the window, inclusive. Defaults to the last loaded season.
+
+        Returns:
+            A tuple containing the mean and standard deviation of the pop time in
+            seconds, NaN when there are not enough seasons.
+        """
+        base = POP_TIME_BASES.get(target_base.lower())
+        if base is None:
+            raise ValueError(f"Invalid target base: {target_base}")
+
+        entry = self._stats.get((int(catcher_id), base))
+        if entry is None:
+            return np.nan, np.nan
+
+        seasons, count, total, total_sq = entry
+        lo = np.searchsorted(seasons, start, side='left') if start is not None else 0
+        hi = np.searchsorted(seasons, end, side='right') if end is not None else len(seasons)
+        if hi <= lo:
+            return np.nan, np.nan
+
+        def window(cumulative):
+            return cumulative[hi - 1] - (cumulative[lo - 1] if lo > 0 else 0)
+
+        n = window(count)
+        mean = window(total) / n
+        if n < 2:
+            return float(mean), np.nan
+        var = (window(total_sq) - n * mean ** 2) / (n - 1)
+        return float(mean), float(np.sqrt(max(var, 0.0)))
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Mean and standard deviation of the pop time of every catcher to every
+        base, computed in a single groupby pass.
+
+        Returns:
+            DataFrame with catcher_id, target_base ('2B'/'3B'), pop_time and pop_time_std.
+        """
+        cols = [col for col in ('pop_2b_sba', 'pop_3b_sba') if col in self.df.columns]
+        grouped = self.df.groupby('entity_id')[cols].agg(['mean', 'std'])
+
+        frames = []
+        for col in cols:
+            frames.append(pd.DataFrame({
+                'catcher_id': grouped.index.astype(int),
+                'target_base': col.split('_')[1].upper(),
+                'pop_time': grouped[(col, 'mean')].to_numpy(),
+                'pop_time_std': grouped[(col, 'std')].to_numpy()
+            }))
+
+        return pd.concat(frames, ignore_index=True)
+
+
+@lru_cache(maxsize=None)
+def get_pop_time_index() -> PopTimeIndex:
+    """
+    Shared PopTimeIndex over the 2016-2025 seasons, built on first use.
+    """
+    return PopTimeIndex()
+
+
 def get_catchers_data(catcher_id: int) -> pd.DataFrame:
-    years = list(range(2016, 2026))
+    return get_pop_time_index().catcher_df(catcher_id)
+
+
+def get_pitcher_data(pitcher_id: int) -> pd.DataFrame:
+    """
+    Retrieve every pitch thrown by a given pitcher from 2008 to today.
+
+    Parameters:
+    - pitcher_id (int): MLBAM ID of the pitcher.
+
+    Returns:
+    - pd.DataFrame: DataFrame containing all pitches, with normalized pitch_type.
+    """
+    # Fetch all pitch data for the pitcher one season at a time so closed seasons stay cached
+    years = list(range(2008, datetime.today().year + 1))
     main_df = pd.DataFrame()
 
     for year in years:
-        df = statcast_catcher_poptime(year, min_2b_att=0, min_3b_att=0)
+        df = cached_fetch(
+            statcast_pitcher,
+            start_dt=f'{year}-01-01',
+            end_dt=f'{year}-12-31',
+            player_id=pitcher_id,
+            season=year
+        )
         main_df = pd.concat([main_df, df], ignore_index=True)
 
-    catcher_df = main_df[main_df['entity_name'].str.lower() == get_name_from_id(catcher_id)]
+    # Check if the DataFrame is empty
+    if main_df.empty:
+        raise ValueError(f"No data found for pitcher ID {pitcher_id} in the specified date range.")
+
+    # Normalize pitch_type entries to handle potential inconsistencies
+    main_df['pitch_type'] = main_df['pitch_type'].astype(str).str.strip().str.upper()
 
-    return catcher_df
+    return main_df
 
 
 def get_pitchers_pitch_data(pitcher_id: int, pitch_type: str) -> pd.DataFrame:
@@ -353,19 +1208,8 @@ def get_pitchers_pitch_data(pitcher_id: int, pitch_type: str) -> pd.DataFrame:
     Returns:
     - pd.DataFrame: DataFrame containing all matching pitches.
     """
-    # Define the start and end dates
-    start_date = '2008-01-01'
-    end_date = datetime.today().strftime('%Y-%m-%d')
+    main_df = get_pitcher_data(pitcher_id)
 
-    # Fetch all pitch data for the pitcher within the specified date range
-    main_df = statcast_pitcher(start_dt=start_date, end_dt=end_date, player_id=pitcher_id)
-
-    # Check if the DataFrame is empty
-    if main_df.empty:
-        raise ValueError(f"No data found for pitcher ID {pitcher_id} in the specified date range.")
-
-    # Normalize pitch_type entries to handle potential inconsistencies
-    main_df['pitch_type'] = main_df['pitch_type'].astype(str).str.strip().str.upper()
     pitch_type = pitch_type.strip().upper()
 
     # Retrieve unique pitch types for the pitcher
@@ -389,7 +1233,7 @@ def get_player_speed(player_id: int) -> pd.DataFrame:
     main_df = pd.DataFrame()
 
     for year in years:
-        df = statcast_sprint_speed(year, min_opp=0)
+        df = cached_fetch(statcast_sprint_speed, year, season=year, min_opp=0)
         main_df = pd.concat([main_df, df], ignore_index=True)
 
     player_df = main_df[main_df['player_id'] == player_id]
@@ -397,14 +1241,34 @@ def get_player_speed(player_id: int) -> pd.DataFrame:
     return player_df
 
 
-from selenium.common.exceptions import NoSuchWindowException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pandas as pd
 from tqdm import tqdm
 
-def get_zone_data(sb_data: str, new_sb_data: str = None):
+def fetch_zone_chart(session: BrowserSession, video_link: str) -> str:
+    """
+    Inner HTML of the zone chart of a video page, loaded in the session's tab.
+    """
+    session.get(video_link)
+    session.wait.until(EC.presence_of_element_located((By.ID, "zone_chart")))
+    return session.driver.find_element(By.ID, "zone_chart").get_attribute("innerHTML")
+
+
+def get_zone_data(sb_data: str, new_sb_data: str = None, pool_size: int = 4):
+    """
+    Add the strike zone chart of every attempt of sb_data, written to
+    new_sb_data as the pages come in. Attempts already in new_sb_data are
+    skipped, so an interrupted run resumes. Video pages are loaded
+    concurrently by a BrowserPool of pool_size drivers, so rows are written
+    in completion order.
+
+    Args:
+        sb_data: CSV of attempts.
+        new_sb_data: CSV the attempts with their strike zone are appended to.
+        pool_size: Number of browsers loading video pages.
+    """
     sb_df = pd.read_csv(sb_data)
 
     if 'strike_zone' not in sb_df.columns:
@@ -427,58 +1291,25 @@ def get_zone_data(sb_data: str, new_sb_data: str = None):
         sb_df.iloc[0:0].to_csv(new_sb_data, index=False)
         processed_rows = set()
 
-    try:
-        driver = init_driver()
-        wait = WebDriverWait(driver, 2)
-
-        # Open a blank tab to avoid closing the main session
-        driver.get("about:blank")
-        base_tab = driver.current_window_handle
-
-        for row in tqdm(sb_df.itertuples(index=False, name=None), total=len(sb_df), desc="Fetching zone data"):
-            row_key = tuple(row[:-1])
-            if row_key in processed_rows:
-                continue
+    pending = [
+        row for row in sb_df.itertuples(index=False, name=None)
+        if tuple(row[:-1]) not in processed_rows
+    ]
 
-            video_link = row[-2]
-            strike_zone = None
+    def fetch(session, row):
+        # video_link is the column before strike_zone
+        return fetch_zone_chart(session, row[-2])
 
-            try:
-                # Open new tab and switch to it
-                driver.execute_script("window.open('');")
-                new_tab = [tab for tab in driver.window_handles if tab != base_tab][-1]
-                driver.switch_to.window(new_tab)
-
-                driver.get(video_link)
-                wait.until(EC.presence_of_element_located((By.ID, "zone_chart")))
-                strike_zone = driver.find_element(By.ID, "zone_chart").get_attribute("innerHTML")
-
-            except (NoSuchWindowException, WebDriverException) as e:
-                print(f"[SKIP] Chrome window error for row {row}: {e}")
-            except Exception as e:
-                print(f"[SKIP] General error fetching zone for row {row}: {e}")
-            finally:
-                # Close current tab and return to base tab
-                try:
-                    driver.close()
-                    driver.switch_to.window(base_tab)
-                except Exception:
-                    pass
-
-            if strike_zone is None:
+    with BrowserPool(pool_size, init_driver, timeout=2) as pool, open(new_sb_data, 'a', newline='') as f:
+        writer = csv.writer(f)
+        for row, strike_zone, error in tqdm(pool.map(fetch, pending), total=len(pending), desc="Fetching zone data"):
+            if error is not None:
+                print(f"[SKIP] Error fetching zone for row {row}: {error}")
                 continue
+            writer.writerow(['' if pd.isna(value) else value for value in row[:-1]] + [strike_zone])
+            f.flush()
 
-            new_row = list(row[:-1]) + [strike_zone]
-            with open(new_sb_data, 'a') as f:
-                pd.DataFrame([new_row], columns=sb_df.columns).to_csv(f, header=False, index=False)
-
-    finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
-
-    print("Strike zone data fetch complete.")
+        print(f"Strike zone data fetch complete, {pool.stats()}.")
 
 
 
@@ -520,6 +1351,9 @@ if __name__ == '__main__':
 # ------------------------- Update pitch descriptions ------------------------ #
 #     update_description(file)
 
+# --------------------- All of the above in a single pass -------------------- #
+#     default_cleaning_pipeline(player_info).run(file)
+
     # merge_csvs(['/Users/robbykapua/Documents/GitHub/idea-lab/sb_probability/sb_data_worker_0.csv',
     #                      '/Users/robbykapua/Documents/GitHub/idea-lab/sb_probability/sb_data_worker_1.csv'],
     #            '/Users/robbykapua/Documents/GitHub/idea-lab/sb_probability/data/sb_data_complete/sb_data_2016-2021.csv')